@@ -1,6 +1,38 @@
 import sys
-from controller import Controller
-from PyQt5.QtWidgets import QApplication
+import traceback
+from PyQt5.QtCore import Qt, QThread
+from PyQt5.QtGui import QColor, QPixmap
+from PyQt5.QtWidgets import QApplication, QSplashScreen
+
+# The UI is written against PyQt5 only. Mixing in another Qt binding would load a second Qt
+# and route calls through slower bindings, so refuse to start if one has been imported.
+if "PyQt6" in sys.modules or "PySide6" in sys.modules:
+    raise ImportError("The application must run on PyQt5; PyQt6/PySide6 must not be imported.")
+
+class ControllerLoader(QThread):
+    """
+    Summary:
+    This class represents a thread that imports the controller module, so the import does not block
+    the main loop while the splash screen is painted.
+
+    Usage:
+    Create an object, connect to its finished signal and call start(). Once finished,
+    controller_class holds the Controller class, or error holds the exception raised by the import.
+    """
+
+    def __init__(self):
+        QThread.__init__(self)
+        self.controller_class = None
+        self.error = None
+
+    def run(self) -> None:
+        try:
+            import controller
+        except BaseException as error:  # Reported by the main thread, which can stop the application
+            self.error = error
+            return
+
+        self.controller_class = controller.Controller
 
 
 class Application(QApplication):
@@ -8,6 +40,8 @@ class Application(QApplication):
     Summary:
     This Class represents an application containing the UI and Logic.
     It uses QApplication from pyqt5 to create a running application.
+    The controller module is imported in a separate thread while a splash screen is shown, and
+    the controller is created in the main thread once the import has finished.
 
     Usage:
     To use this class you must create an object and call its run() method.
@@ -15,15 +49,45 @@ class Application(QApplication):
 
     def __init__(self):
         QApplication.__init__(self, sys.argv)
-        self._controller = Controller()
+        self._controller = None
+        self._splash = self._create_splash()
+        self._loader = ControllerLoader()
+        self._loader.finished.connect(self._boot)
+
+    def _create_splash(self) -> QSplashScreen:
+        """
+        This method creates and shows a plain splash screen.
+        """
+
+        pixmap = QPixmap(400, 200)
+        pixmap.fill(QColor(22, 22, 22))
+        splash = QSplashScreen(pixmap)
+        splash.showMessage("Loading...", Qt.AlignCenter, Qt.white)
+        splash.show()
+        return splash
 
-    def run(self):
+    def _boot(self) -> None:
         """
-        Starts the controller and the main QApplication loop.
+        This method is called in the main thread once the controller module has been imported.
+        It creates and runs the controller and closes the splash screen.
+        If the import failed, the error is printed and the application quits.
         """
 
+        if self._loader.controller_class is None:
+            self._splash.close()
+            traceback.print_exception(type(self._loader.error), self._loader.error, self._loader.error.__traceback__)
+            self.exit(1)
+            return
+        self._controller = self._loader.controller_class()
+        self.aboutToQuit.connect(self._controller.exit)
         self._controller.run()
-        try:
-            sys.exit(self.exec())
-        except SystemExit:
-            self._controller.exit()
+        self._splash.finish(self._controller.main_window)
+
+    def run(self) -> int:
+        """
+        Starts loading the controller and starts the main QApplication loop.
+        Returns the exit code of the loop. The controller exits when the application is about to quit.
+        """
+
+        self._loader.start()
+        return self.exec()
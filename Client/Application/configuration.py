@@ -1,29 +1,109 @@
-from configparser import ConfigParser
+import mmap
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, NamedTuple
 
-path = "config.ini"
-parser = ConfigParser()
-parser.read(path)
+_BASE_DIR = Path(__file__).resolve().parent
+path = _BASE_DIR / "config.ini"
+
+
+class Config(NamedTuple):
+    """
+    Immutable configuration values of the client.
+    """
+
+    host: str
+    port_communication: int
+    port_streaming: int
+    socket_buffer_size: int
+    client_id: str
+    history_path: Path
+    playlists_path: Path
+    images_path: Path
+
+
+def _read_ini(file_path: Path) -> Dict[str, Dict[str, str]]:
+    """
+    Reads a simple INI file and returns {section: {key: value}}. Only sections, 'key = value' lines,
+    blank lines and comments are supported. A missing file gives an empty dict.
+    """
+
+    sections = {}
+    try:
+        with open(file_path, "rb") as ini_file:
+            if os.fstat(ini_file.fileno()).st_size == 0:  # mmap cannot map an empty file
+                return sections
+            with mmap.mmap(ini_file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                lines = data[:].decode("utf-8").splitlines()
+    except FileNotFoundError:
+        return sections
+
+    section = None
+    for line in lines:
+        line = line.strip()
+        if not line or line[0] in "#;":
+            continue
+        if line[0] == "[" and line[-1] == "]":
+            section = sections.setdefault(line[1:-1].strip(), {})
+        elif section is not None and "=" in line:
+            key, value = line.split("=", 1)
+            section[key.strip().lower()] = value.strip()
+    return sections
+
+
+@lru_cache(maxsize=1)
+def _load() -> Config:
+    """
+    Reads the configuration file on the first call and returns the configuration values.
+    """
+
+    config = _read_ini(path)
+    server = config.get('server', {})
+    client = config.get('client', {})
+    paths = config.get('paths', {})
+    history_relative_path = paths.get('history_relative_path', '')
+    playlists_relative_path = paths.get('playlists_relative_path', '')
+    images_relative_path = paths.get('images_relative_path', '')
+    return Config(
+        host=server.get('host', ''),
+        port_communication=int(server.get('port_communication', 9191)),
+        port_streaming=int(server.get('port_streaming', 9090)),
+        socket_buffer_size=int(server.get('socket_buffer_size', 8388608)),
+        client_id=client.get('id', '111111'),
+        history_path=(_BASE_DIR / history_relative_path).resolve(),
+        playlists_path=(_BASE_DIR / playlists_relative_path).resolve(),
+        images_path=(_BASE_DIR / images_relative_path).resolve(),
+    )
 
 
 def get_host() -> str:
-    return parser.get('server', 'host', fallback='')
+    return _load().host
 
 
 def get_port_communication() -> int:
-    return parser.getint('server', 'port_communication', fallback=9191)
+    return _load().port_communication
 
 
 def get_port_streaming() -> int:
-    return parser.getint('server', 'port_streaming', fallback=9090)
+    return _load().port_streaming
+
+
+def get_socket_buffer_size() -> int:
+    return _load().socket_buffer_size
 
 
 def get_client_id() -> str:
-    return parser.get('client', 'id', fallback='111111')
+    return _load().client_id
+
+
+def get_history_path() -> Path:
+    return _load().history_path
 
 
-def get_history_relative_path() -> str:
-    return parser.get('paths', 'history_relative_path', fallback='')
+def get_playlists_path() -> Path:
+    return _load().playlists_path
 
 
-def get_playlists_relative_path() -> str:
-    return parser.get('paths', 'playlists_relative_path', fallback='')
+def get_images_path() -> Path:
+    return _load().images_path
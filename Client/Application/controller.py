@@ -1,17 +1,31 @@
 import socket
+import struct
 import threading
-import pickle
+import time
 import os
+import queue
 import base64
 import csv
-import re
-from typing import List, Dict
+import sqlite3
+from concurrent.futures import Future
+from collections import deque
+from functools import partial
+from typing import List, Dict, Optional, Iterator, Tuple, Set, Deque
 
 import configuration
 from mediaplayer import MediaPlayer
 from window import Window
 from eventsystem import Listener
-from song import Song
+from song import Song, LazyImageSong
+
+# Only the most played songs and artists of the history are considered for the four recommendations
+RECOMMENDATION_SONGS_LIMIT = 64
+RECOMMENDATION_ARTISTS_LIMIT = 16
+RECOMMENDATION_SEARCH_TIMEOUT = 10  # Seconds to wait for the server search of a recommendation
+RECV_FLAGS = getattr(socket, "MSG_WAITALL", 0)  # Not available on every platform
+U32 = struct.Struct("<I")  # Lengths and ids on the wire are 4-byte little-endian
+# The terminate request never changes, so its length prefix and payload are built once
+TERMINATE_SONG_DATA_RECV_REQUEST = U32.pack(len(b"TERMINATE_SONG_DATA_RECV@")) + b"TERMINATE_SONG_DATA_RECV@"
 
 
 class Controller(Listener):
@@ -26,21 +40,29 @@ class Controller(Listener):
 
     def __init__(self, window=True):
         Listener.__init__(self)
-        csv.field_size_limit(2000000000)  # Increase csv size limit to store images
+        csv.field_size_limit(2000000000)  # Increase csv size limit to read playlists with embedded images
 
         # CONFIGURATION
         self._host = configuration.get_host()
         self._port_communication = configuration.get_port_communication()
-        self._playlists_relative_path = configuration.get_playlists_relative_path()
-        self._history_relative_path = configuration.get_history_relative_path()
+        self._socket_buffer_size = configuration.get_socket_buffer_size()
+        self._playlists_path = configuration.get_playlists_path()
+        self._history_path = configuration.get_history_path()
+        self._images_path = configuration.get_images_path()
         self._client_id = configuration.get_client_id().encode("utf-8")
         # CONFIGURATION
 
         # ATTRIBUTES
         self._song_queue = []
-        self._network_request_queue = []
-        self._internal_request_queue = []
-        self._internal_search_results = []
+        self._network_request_queue = queue.Queue()
+        self._internal_request_queue = queue.Queue()
+        self._recv_buffer = bytearray(1 << 20)  # Reused for every song received from the server
+        self._recv_view = memoryview(self._recv_buffer)
+        self._length_view = memoryview(bytearray(4))  # Reused for 4-byte length prefixes
+        self._links_cache = (None, 0)  # (playlist links, playlists directory mtime)
+        self._search_index = (None, 0, [], {})  # (playlist link, playlist file mtime, index, trigrams)
+        self._playlist_id_sets: Dict[str, Set[int]] = {}  # Song ids of each playlist, loaded when first needed
+        self._songs_cache: Dict[str, Tuple[int, List[Song]]] = {}  # {playlist link: (playlist file mtime, songs)}
         self._create_controller_client()
         if window:
             self._window = Window()
@@ -48,6 +70,8 @@ class Controller(Listener):
             self._window = None
         self.current_playlist = None
         self._slider_busy = False
+        self._history_db = None  # Connected on first use, see _get_history_db()
+        self._history_lock = threading.Lock()
         self._mediaplayer = MediaPlayer(
             send_progress_info_callback=self._get_progress,
             terminate_song_data_recv_request_callback=self._terminate_song_data_recv_request,
@@ -85,10 +109,6 @@ class Controller(Listener):
 
         # THREADING EVENTS
         self._reconnect = threading.Event()
-        self._new_network_request_flag = threading.Event()
-        self._new_internal_request_flag = threading.Event()
-        self._internal_search = threading.Event()
-        self._activity_file_flag = threading.Event()
         # THREADING EVENTS
 
         # THREADS
@@ -106,71 +126,62 @@ class Controller(Listener):
     def __del__(self):
         self._controller_client.close()
 
-    def _set_internal_search_results(self, results: List[Song]) -> None:
+    @property
+    def main_window(self):
+        return self._window
+
+    @staticmethod
+    def _build_artist_index(song_data: List[List[str]]) -> Dict[str, List[int]]:
         """
-        Call this method to update the internal search results attribute with new results.
+        This method takes a list of history rows sorted by how many times a song was played.
+        It returns a dictionary that maps every artist to the indexes of their songs in song_data.
+        Indexes are stored in reverse order, so the most listened song of an artist is popped from the end.
         """
 
-        self._internal_search_results.clear()
-        self._internal_search_results.extend(results)
-        self._internal_search.set()
+        artist_index = {}
+        for index in range(len(song_data) - 1, -1, -1):
+            artist_index.setdefault(song_data[index][2], []).append(index)
+        return artist_index
 
     @staticmethod
-    def _priority_first(song_data: List[List[str]], artist_data: List[Dict[str, int]]):
-        """
-        This method takes a list of rows from csv file that has information about a song object and a list
-        of dictionaries that has information for artists.
-        This method finds the most listened songs from different artists and returns song_data, and artist_data,
-        and one song object if the algorithm was successful. If a song is returned, song_data, and artist_data will
-        exclude information of this song.
-        """
+    def _row_to_song(row) -> Song:
+        return Song(int(row[0]), row[1], row[2], int(row[3]), row[4])
 
-        try:
-            if artist_data and song_data:
-                index, data = next(
-                    (index, data)
-                    for index, data in enumerate(song_data)
-                    if artist_data[0]["artist"] == data[2]
-                )
-                image_bytes = Controller._string_to_bytes(data[4])
-                song = Song(int(data[0]), data[1], data[2], int(data[3]), image_bytes)
-                song_data.pop(index)
-                artist_data.pop(0)
-                return song_data, artist_data, song  # If a song was found
-            else:
-                return (
-                    song_data,
-                    artist_data,
-                    None,
-                )  # If no more artist_data or song_data
-        except StopIteration:
-            return song_data, artist_data, None  # Next Exception
+    @staticmethod
+    def _priority_first(
+        song_data: List[List[str]], artist_queue: Deque[Dict[str, int]], artist_index: Dict[str, List[int]]
+    ) -> Optional[Song]:
+        """
+        This method takes a list of history rows that have information about a song object, a deque
+        of dictionaries that has information for artists, and the artist index of song_data.
+        This method finds the most listened songs from different artists and returns one song object if the
+        algorithm was successful. If a song is returned, artist_queue and artist_index will exclude
+        information of this song.
+        """
+
+        if artist_queue:
+            indexes = artist_index.get(artist_queue[0]["artist"])
+            if indexes:
+                artist_queue.popleft()
+                return Controller._row_to_song(song_data[indexes.pop()])
+        return None
 
     @staticmethod
-    def _priority_second(song_data: List[List[str]], artist: Dict[str, int]):
+    def _priority_second(
+        song_data: List[List[str]], artist: Dict[str, int], artist_index: Dict[str, List[int]]
+    ) -> Optional[Song]:
         """
-        This method takes a list of rows from csv file that has information about a song object and a dictionary
-        that has information about an artist.
-        This method finds the most listened songs from the most listened artist and returns song_data,
-        and one song object if the algorithm was successful. If a song is returned, song_data will
-        exclude information of this song.
+        This method takes a list of history rows that have information about a song object, a dictionary
+        that has information about an artist, and the artist index of song_data.
+        This method finds the most listened songs from the most listened artist and returns one song object
+        if the algorithm was successful. If a song is returned, artist_index will exclude information of this song.
         """
 
-        try:
-            if song_data and artist:
-                index, data = next(
-                    (index, data)
-                    for index, data in enumerate(song_data)
-                    if artist["artist"] == data[2]
-                )
-                image_bytes = Controller._string_to_bytes(data[4])
-                song = Song(int(data[0]), data[1], data[2], int(data[3]), image_bytes)
-                song_data.pop(index)
-                return song_data, song
-            else:
-                return song_data, None
-        except StopIteration:
-            return song_data, None
+        if artist:
+            indexes = artist_index.get(artist["artist"])
+            if indexes:
+                return Controller._row_to_song(song_data[indexes.pop()])
+        return None
 
     def _priority_third(self, artist: Dict[str, int], recommendations: List[Song]):
         """
@@ -180,10 +191,12 @@ class Controller(Listener):
 
         if artist and recommendations:
             artist_name = artist["artist"]
-            self._internal_search.clear()
-            self._add_network_request("search", "internal", artist_name)
-            self._internal_search.wait()
-            results = self._internal_search_results
+            try:
+                results = self._add_network_request("search", "internal", artist_name).result(
+                    RECOMMENDATION_SEARCH_TIMEOUT
+                )
+            except Exception:  # No answer in time or a failed search, no recommendation
+                return None
             recommendation_ids = [
                 recommendation.song_id for recommendation in recommendations
             ]
@@ -195,7 +208,8 @@ class Controller(Listener):
 
     def _find_recommendations(self, song_data: List[List[str]], artist_data: List[Dict[str, int]]):
         """
-        This method takes song_data and artist_data, and it finds four recommendations based on user's history.
+        This method takes song_data sorted by count (how many times a song was played) and artist_data,
+        and it finds four recommendations based on user's history.
         It uses three algorithms with different priorities.
         First priority finds the most listened songs from different artists. Second priority finds songs from the most
         listened artist. Third priority finds songs from known artists.
@@ -203,21 +217,15 @@ class Controller(Listener):
         """
 
         recommendations = []  # Store all recommendations
-        song_data.sort(
-            key=lambda x: int(x[5]), reverse=True
-        )  # At 5 is count (how many times a song was played)
-
         artist_data.sort(
             key=lambda k: k["count"], reverse=True
         )  # How many times an artist was played
 
-        temp_song_data = song_data.copy()
-        temp_artist_data = artist_data.copy()
+        artist_index = Controller._build_artist_index(song_data)
+        artist_queue = deque(artist_data)
         flag = False
         while len(recommendations) < 4 and not flag:
-            temp_song_data, temp_artist_data, song = Controller._priority_first(
-                temp_song_data, temp_artist_data
-            )
+            song = Controller._priority_first(song_data, artist_queue, artist_index)
             if song:
                 recommendations.append(song)  # Song found, first priority
                 continue
@@ -225,8 +233,8 @@ class Controller(Listener):
                 count_second = 0
                 while len(recommendations) < 4 and not flag:
                     if count_second < len(artist_data):
-                        temp_song_data, song = Controller._priority_second(
-                            temp_song_data, artist_data[0]
+                        song = Controller._priority_second(
+                            song_data, artist_data[0], artist_index
                         )
                         if song:
                             recommendations.append(song)  # Song found, second priority
@@ -257,37 +265,49 @@ class Controller(Listener):
         the home menu with at most four recommendations.
         """
 
-        self._activity_file_flag.wait()  # If history file is opened, wait
-        self._activity_file_flag.clear()
-        path = self._history_relative_path
         try:
-            with open(path, mode="r", newline="") as csv_file:
-                csv_reader = csv.reader(csv_file, delimiter=",")
-                rows = [row for row in csv_reader]  # Store all songs
-            self._activity_file_flag.set()
-            artists = []  # Store all artists
-            for row in rows:
-                try:
-                    # Append artist to artists.
-                    # An artist is a Dict[str, int] {'artist': artist_name, 'count': times_played}
-                    # Check if artist name is the same as the artist in row; if it is the same, increase times_played
-                    result = next(
-                        (index, data)
-                        for index, data in enumerate(artists)
-                        if row[2] == data["artist"]
-                    )
-                    current_count = result[1]["count"]
-                    additional_count = int(row[5])
-                    new_count = current_count + additional_count
-                    artists[result[0]]["count"] = new_count
-                except StopIteration:  # No artist was found for current row, add a new artist
-                    artists.append({"artist": row[2], "count": int(row[5])})
-            recommendations = self._find_recommendations(rows, artists)
-            self._window.display_recommendations(recommendations)
+            with self._history_lock:
+                history_db = self._get_history_db()
+                # Images are left out here and loaded only for the recommended songs
+                rows = history_db.execute(
+                    """SELECT song_id, song_name, artist_name, duration, NULL, count FROM songs
+                    ORDER BY count DESC LIMIT ?""",
+                    (RECOMMENDATION_SONGS_LIMIT,),
+                ).fetchall()
+                artist_rows = history_db.execute(
+                    """SELECT artist_name, SUM(count) FROM songs GROUP BY artist_name
+                    ORDER BY SUM(count) DESC LIMIT ?""",
+                    (RECOMMENDATION_ARTISTS_LIMIT,),
+                ).fetchall()
+        except sqlite3.Error:
+            self._window.show_internal_error()
+            return
+        # An artist is a Dict[str, int] {'artist': artist_name, 'count': times_played}
+        artists = [{"artist": artist, "count": count} for artist, count in artist_rows]
+        recommendations = self._find_recommendations(rows, artists)
+        self._load_history_images(recommendations)
+        self._window.display_recommendations(recommendations)
 
-        except FileNotFoundError:
-            self._activity_file_flag.set()
+    def _load_history_images(self, songs: List[Song]) -> None:
+        """
+        This method sets the image of every song without an image from the history database.
+        """
+
+        song_ids = [song.song_id for song in songs if song.image_binary is None]
+        if not song_ids:
+            return
+        placeholders = ", ".join("?" * len(song_ids))
+        try:
+            with self._history_lock:
+                images = dict(self._get_history_db().execute(
+                    f"SELECT song_id, image FROM songs WHERE song_id IN ({placeholders})", song_ids
+                ).fetchall())
+        except sqlite3.Error:
             self._window.show_internal_error()
+            return
+        for song in songs:
+            if song.image_binary is None:
+                song.image_binary = images.get(song.song_id, b"")
 
     def _update_history(self, song: Song) -> None:
         """
@@ -295,55 +315,66 @@ class Controller(Listener):
         for the current with the new song.
         """
 
-        self._activity_file_flag.wait()
-        self._activity_file_flag.clear()
-        path = self._history_relative_path
         try:
-            # Get existing songs
-            csv_file = open(path, mode="r", newline="")
-            csv_reader = csv.reader(csv_file, delimiter=",")
-            existing_songs = [row for row in csv_reader]
-            csv_file.close()
-            song_exists = False
-
-            for i in range(len(existing_songs)):
-                # If song already exists, increase count by 1
-                if song.song_id == int(existing_songs[i][0]):
-                    song_count = int(existing_songs[i][5])
-                    song_count += 1
-                    existing_songs[i][5] = str(song_count)
-                    song_exists = True
-                    break
-            if song_exists:
-                # Write the new list of songs
-                csv_file = open(path, mode="w", newline="")
-                csv_writer = csv.writer(csv_file, delimiter=",")
-                all_songs = tuple(existing_songs)
-                csv_writer.writerows(all_songs)
-                csv_file.close()
-            else:
-                # If this song does not exist in history, add it with count set to 1
-                csv_file = open(path, mode="a", newline="")
-                csv_writer = csv.writer(csv_file, delimiter=",")
-                image_string = Controller._bytes_to_string(song.image_binary)
-                data = [
-                    song.song_id,
-                    song.song_name,
-                    song.artist_name,
-                    song.duration,
-                    image_string,
-                    1,
-                ]
-                csv_writer.writerow(data)
-                csv_file.close()
+            with self._history_lock:
+                # Add the song with count set to 1, or increase its count by 1 if it already exists
+                self._get_history_db().execute(
+                    """INSERT INTO songs VALUES (?, ?, ?, ?, ?, 1)
+                    ON CONFLICT(song_id) DO UPDATE SET count = count + 1""",
+                    (song.song_id, song.song_name, song.artist_name, song.duration, song.image_binary),
+                )
+        except sqlite3.Error:
+            self._window.show_internal_error()
 
-        except FileNotFoundError:  # If not history file was found, create it and call this method again
-            f = open(path, mode="x")
-            f.close()
-            self._activity_file_flag.set()
-            self._update_history(song)
-        finally:
-            self._activity_file_flag.set()
+    def _get_history_db(self) -> sqlite3.Connection:
+        """
+        This method returns the connection to the history database, and opens it on the first call.
+        Call it while holding _history_lock. Raises sqlite3.Error if the database cannot be opened.
+        """
+
+        if self._history_db is None:
+            self._history_db = self._connect_history_db()
+        return self._history_db
+
+    def _connect_history_db(self) -> sqlite3.Connection:
+        """
+        This method opens the history database and creates the songs table if it does not exist.
+        A new, empty database is filled with the history of the old history.csv file.
+        """
+
+        connection = sqlite3.connect(self._history_path, isolation_level=None, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            """CREATE TABLE IF NOT EXISTS songs (song_id INTEGER PRIMARY KEY, song_name TEXT,
+            artist_name TEXT, duration INTEGER, image BLOB, count INTEGER)"""
+        )
+        if connection.execute("SELECT 1 FROM songs LIMIT 1").fetchone() is None:
+            self._import_history_csv(connection)
+        return connection
+
+    def _import_history_csv(self, connection: sqlite3.Connection) -> None:
+        """
+        This method copies the rows of history.csv, stored next to the history database by older versions,
+        into the songs table. The csv file is left in place.
+        """
+
+        csv_path = self._history_path.with_suffix(".csv")
+        try:
+            with open(csv_path, mode="r", newline="") as csv_file:
+                # song_id, song_name, artist_name, duration, base64 image, count
+                rows = [
+                    (int(row[0]), row[1], row[2], int(row[3]), Controller._string_to_bytes(row[4]), int(row[5]))
+                    for row in csv.reader(csv_file, delimiter=",")
+                    if row
+                ]
+        except FileNotFoundError:
+            return
+        except (ValueError, IndexError):
+            print(f"Could not import the history of {csv_path}: the file is malformed.")
+            return
+        connection.execute("BEGIN")
+        connection.executemany("INSERT OR IGNORE INTO songs VALUES (?, ?, ?, ?, ?, ?)", rows)
+        connection.execute("COMMIT")
 
     def _set_shuffle_state(self, state: int) -> None:
         self._mediaplayer.set_shuffle_state(state)
@@ -367,28 +398,73 @@ class Controller(Listener):
         Pass a string as parameter, and the method will update the window with the found song if any,
         """
 
-        search_string_serialized = "".join(search_string.split())
-        if search_string_serialized == "":
-            self._window.display_playlist_songs(
-                self._get_playlist_songs(self.current_playlist), self.current_playlist
-            )
-            return
-        results = []
-        playlist_songs = self._get_playlist_songs(self.current_playlist)
-        for playlist_song in playlist_songs:
-            song_name_serialized = "".join(playlist_song.song_name.split())
-            artist_name_serialized = "".join(playlist_song.artist_name.split())
-            # Find songs that match with the pattern
-            if re.search(
-                search_string_serialized, song_name_serialized, re.IGNORECASE
-            ) or re.search(
-                search_string_serialized, artist_name_serialized, re.IGNORECASE
-            ):
-                results.append(playlist_song)
+        index, trigrams = self._get_search_index()
+        needle = "".join(search_string.split()).casefold()
+        if needle == "":
+            results = [song for _, _, song in index]
+        else:  # Find songs whose name or artist contains the search string
+            if len(needle) < 3:
+                candidates = range(len(index))
+            else:  # Only songs that contain every trigram of the search string can match
+                candidates = None
+                for i in range(len(needle) - 2):
+                    positions = trigrams.get(needle[i:i + 3])
+                    if not positions:
+                        candidates = set()
+                        break
+                    candidates = positions if candidates is None else candidates & positions
+                candidates = sorted(candidates)
+            results = [
+                index[position][2]
+                for position in candidates
+                if needle in index[position][0] or needle in index[position][1]
+            ]
         self._window.display_playlist_songs(
             results, self.current_playlist
         )  # Update window
 
+    @staticmethod
+    def _build_trigram_index(index: List[Tuple[str, str, Song]]) -> Dict[str, Set[int]]:
+        """
+        This method takes the search index of a playlist and returns a dictionary that maps every
+        three-character substring of the song and artist names to the positions of the songs that contain it.
+        """
+
+        trigrams = {}
+        for position, (song_name, artist_name, _) in enumerate(index):
+            for name in (song_name, artist_name):
+                for i in range(len(name) - 2):
+                    trigrams.setdefault(name[i:i + 3], set()).add(position)
+        return trigrams
+
+    def _get_search_index(self) -> Tuple[List[Tuple[str, str, Song]], Dict[str, Set[int]]]:
+        """
+        This method returns (song name, artist name, song) for every song in the current playlist, with the names
+        case-folded and stripped of whitespace, together with the trigram index of the names.
+        The index is rebuilt only when the playlist file changes.
+        """
+
+        playlist_path = self._playlists_path / f"{self.current_playlist}.csv"
+        try:
+            modified = os.stat(playlist_path).st_mtime_ns
+        except FileNotFoundError:
+            self._window.show_internal_error()
+            return [], {}
+        playlist_link, cached_modified, index, trigrams = self._search_index
+        if playlist_link == self.current_playlist and cached_modified == modified:
+            return index, trigrams
+        index = [
+            (
+                "".join(song.song_name.split()).casefold(),
+                "".join(song.artist_name.split()).casefold(),
+                song,
+            )
+            for song in self._get_playlist_songs(self.current_playlist)
+        ]
+        trigrams = Controller._build_trigram_index(index)
+        self._search_index = (self.current_playlist, modified, index, trigrams)
+        return index, trigrams
+
     def _play_current_playlist(self) -> None:
         """
         Call this method to play the entire current playlist. The queue will be cleared, and the first
@@ -414,9 +490,11 @@ class Controller(Listener):
         If the name is invalid, the user will be notified.
         """
 
-        path = self._playlists_relative_path
+        path = self._playlists_path
         try:
-            os.rename(f"{path}{self.current_playlist}.csv", f"{path}{name}.csv")
+            os.rename(path / f"{self.current_playlist}.csv", path / f"{name}.csv")
+            self._playlist_id_sets.pop(self.current_playlist, None)
+            self._songs_cache.pop(self.current_playlist, None)
             self._window.display_playlist_links(
                 self._get_playlist_links(), mode="rename", active=name
             )
@@ -433,9 +511,8 @@ class Controller(Listener):
         This method will create a new playlist with the specified name.
         """
 
-        path = self._playlists_relative_path
         try:
-            f = open(f"{path}{name}.csv", mode="x")
+            f = open(self._playlists_path / f"{name}.csv", mode="x")
             f.close()
             self._window.display_playlist_links(
                 self._get_playlist_links(), mode="new", active=name
@@ -451,9 +528,10 @@ class Controller(Listener):
         This method will delete the current playlist.
         """
 
-        path = self._playlists_relative_path
         try:
-            os.remove(f"{path}{self.current_playlist}.csv")
+            os.remove(self._playlists_path / f"{self.current_playlist}.csv")
+            self._playlist_id_sets.pop(self.current_playlist, None)
+            self._songs_cache.pop(self.current_playlist, None)
             self._window.display_playlist_links(
                 self._get_playlist_links(), mode="delete"
             )
@@ -467,66 +545,96 @@ class Controller(Listener):
         Add a song to the specified playlist.
         """
 
-        path = self._playlists_relative_path
         try:
-            with open(f"{path}{playlist_link}.csv", mode="r") as csv_file:
-                csv_reader = csv.reader(csv_file, delimiter=",")
-                for row in csv_reader:
-                    if int(row[0]) == song.song_id:
-                        self._window.show_song_exists(
-                            song.song_name, playlist_link
-                        )  # Song already exists
-                        return
+            playlist_ids = self._get_playlist_ids(playlist_link)
         except FileNotFoundError:  # Display internal error
             self._window.show_internal_error()
+            return
+        if song.song_id in playlist_ids:
+            self._window.show_song_exists(
+                song.song_name, playlist_link
+            )  # Song already exists
+            return
 
         try:
-            with open(f"{path}{playlist_link}.csv", mode="a", newline="") as csv_file:
+            self._save_image(song)
+            with open(self._playlists_path / f"{playlist_link}.csv", mode="a", newline="") as csv_file:
                 csv_writer = csv.writer(csv_file, delimiter=",")
-                image_string = Controller._bytes_to_string(song.image_binary)
                 song_data = [
                     song.song_id,
                     song.song_name,
                     song.artist_name,
                     song.duration,
-                    image_string,
+                    "",  # The image is stored in the images directory
                 ]
                 csv_writer.writerow(song_data)  # Add the song to the playlist
+            playlist_ids.add(song.song_id)
+            self._forget_playlist_songs(playlist_link)
         except FileNotFoundError:
             self._window.show_internal_error()
 
+    def _get_playlist_ids(self, playlist_link: str) -> Set[int]:
+        """
+        This method returns the set of song ids in the playlist. The set is read from the playlist file
+        on the first call and kept until the playlist is modified.
+        Raises FileNotFoundError if the playlist does not exist.
+        """
+
+        playlist_ids = self._playlist_id_sets.get(playlist_link)
+        if playlist_ids is None:
+            with open(self._playlists_path / f"{playlist_link}.csv", mode="r", newline="") as csv_file:
+                playlist_ids = {int(row[0]) for row in csv.reader(csv_file, delimiter=",")}
+            self._playlist_id_sets[playlist_link] = playlist_ids
+        return playlist_ids
+
     def _get_playlist_links(self) -> List[str]:
         """
         This method returns all playlists as a list of strings.
+        The list is cached until the modification time of the playlists directory changes.
         """
 
-        links = []
-        path = self._playlists_relative_path
-        for filename in os.listdir(path):
-            playlist_link = filename.split(".")[0]
-            links.append(playlist_link)
+        path = self._playlists_path
+        modified = os.stat(path).st_mtime_ns
+        links, cached_modified = self._links_cache
+        if links is not None and cached_modified == modified:  # Directory unchanged
+            return links
+        with os.scandir(path) as entries:
+            links = [entry.name[:-4] for entry in entries if entry.name.endswith(".csv")]
+        self._links_cache = (links, modified)
         return links
 
+    def _iter_playlist_songs(self, playlist_link: str) -> Iterator[Song]:
+        """
+        This method yields the songs of the playlist one by one. Images are loaded only when they are used.
+        Raises FileNotFoundError if the playlist does not exist.
+        """
+
+        playlist_path = self._playlists_path / f"{playlist_link}.csv"
+        with open(playlist_path, mode="r", newline="", buffering=1 << 20) as csv_file:
+            for row in csv.reader(csv_file, delimiter=","):
+                song_id = int(row[0])
+                yield LazyImageSong(
+                    song_id, row[1], row[2], int(row[3]), partial(self._load_image, song_id, row[4])
+                )
+
     def _get_playlist_songs(self, playlist_link: str) -> List[Song]:
         """
         Call this method to get a list of all songs in the current playlist.
+        The songs are cached until the modification time of the playlist file changes.
         """
 
-        path = self._playlists_relative_path
-        playlist_songs = []
-        playlist_path = f"{path}{playlist_link}.csv"
+        playlist_path = self._playlists_path / f"{playlist_link}.csv"
         try:
-            with open(playlist_path, mode="r", newline="") as csv_file:
-                csv_reader = csv.reader(csv_file, delimiter=",")
-                for row in csv_reader:
-                    image_bytes = Controller._string_to_bytes(row[4])
-                    # Create song objects
-                    playlist_songs.append(
-                        Song(int(row[0]), row[1], row[2], int(row[3]), image_bytes)
-                    )
+            modified = os.stat(playlist_path).st_mtime_ns
+            cached = self._songs_cache.get(playlist_link)
+            if cached is not None and cached[0] == modified:  # Playlist unchanged
+                return list(cached[1])
+            songs = list(self._iter_playlist_songs(playlist_link))
         except FileNotFoundError:
             self._window.show_internal_error()
-        return playlist_songs
+            return []
+        self._songs_cache[playlist_link] = (modified, songs)
+        return list(songs)
 
     def _update_playlist(self, playlist_link: str) -> None:
         """
@@ -543,28 +651,58 @@ class Controller(Listener):
         Remove a song from playlist using its song_id attribute.
         """
 
-        path = self._playlists_relative_path
-        playlist_path = f"{path}{self.current_playlist}.csv"  # Current Playlist
-        updated_playlist = []
+        playlist_path = self._playlists_path / f"{self.current_playlist}.csv"  # Current Playlist
+        temporary_path = playlist_path.with_name(f"{playlist_path.name}.tmp")
+        song_id_prefix = f"{song_id},".encode("utf-8")
         try:
-            # Get all songs excluding the one with song_id == song_id
-            with open(playlist_path, "r") as csv_file:
-                csv_reader = csv.reader(csv_file, delimiter=",")
-                for row in csv_reader:
-                    if int(row[0]) != song_id:
-                        updated_playlist.append(row)
+            # Copy all rows except the one starting with song_id, without parsing them
+            with open(playlist_path, "rb") as playlist_file, open(temporary_path, "wb") as temporary_file:
+                for line in playlist_file:
+                    if not line.startswith(song_id_prefix):
+                        temporary_file.write(line)
+            os.replace(temporary_path, playlist_path)
         except FileNotFoundError:
             self._window.show_internal_error()
+        self._playlist_id_sets.pop(self.current_playlist, None)
+        self._forget_playlist_songs(self.current_playlist)
+        # Update the playlist
+        self._update_playlist(self.current_playlist)
+
+    def _forget_playlist_songs(self, playlist_link: str) -> None:
+        """
+        Call this method after the playlist file is written. The cached songs and search index of the playlist
+        are dropped, so they are read again even if the file modification time did not change.
+        """
 
+        self._songs_cache.pop(playlist_link, None)
+        if self._search_index[0] == playlist_link:
+            self._search_index = (None, 0, [], {})
+
+    def _save_image(self, song: Song) -> None:
+        """
+        Stores the image of a song in the images directory as {song_id}.bin, unless it is already stored.
+        """
+
+        os.makedirs(self._images_path, exist_ok=True)
         try:
-            # Write the updated playlist to the file
-            with open(playlist_path, "w", newline="") as csv_file:
-                csv_writer = csv.writer(csv_file, delimiter=",")
-                csv_writer.writerows(updated_playlist)
+            with open(self._images_path / f"{song.song_id}.bin", mode="xb") as image_file:
+                image_file.write(song.image_binary)
+        except FileExistsError:
+            pass
+
+    def _load_image(self, song_id: int, image_string: str) -> bytes:
+        """
+        Returns the image of a song. Older playlists store the image in the csv file as a base64 string;
+        otherwise the image is read from the images directory.
+        """
+
+        if image_string:
+            return Controller._string_to_bytes(image_string)
+        try:
+            with open(self._images_path / f"{song_id}.bin", mode="rb") as image_file:
+                return image_file.read()
         except FileNotFoundError:
-            self._window.show_internal_error()
-        # Update the playlist
-        self._update_playlist(self.current_playlist)
+            return b""
 
     @staticmethod
     def _string_to_bytes(string: str) -> bytes:
@@ -572,12 +710,6 @@ class Controller(Listener):
         image = base64.b64decode(image)
         return image
 
-    @staticmethod
-    def _bytes_to_string(image_bytes: bytes) -> str:
-        image = base64.b64encode(image_bytes)
-        string = image.decode("utf-8")
-        return string
-
     def display_queue(self, results):
         """
         Display the entire queue in window.
@@ -619,14 +751,8 @@ class Controller(Listener):
         """
 
         while True:
-            self._new_network_request_flag.wait()  # Wait for new network request
-            network_request = self._network_request_queue[0]
+            network_request = self._network_request_queue.get()  # Wait for new network request
             self._execute_network_request(network_request)
-            del self._network_request_queue[
-                0
-            ]  # Delete the request from queue after completion
-            if len(self._network_request_queue) == 0:
-                self._new_network_request_flag.clear()
 
     def _internal_request_loop(self):
         """
@@ -636,14 +762,11 @@ class Controller(Listener):
         """
 
         while True:
-            self._new_internal_request_flag.wait()  # Wait for a new internal request
-            internal_request = self._internal_request_queue[0]
-            self._execute_internal_request(internal_request)
-            del self._internal_request_queue[
-                0
-            ]  # Delete the request from queue after completion
-            if len(self._internal_request_queue) == 0:
-                self._new_internal_request_flag.clear()
+            internal_request = self._internal_request_queue.get()  # Wait for a new internal request
+            try:
+                self._execute_internal_request(internal_request)
+            except Exception as error:  # Keep serving requests
+                print(f"[INTERNAL REQUEST ERROR] - {internal_request[0]}: {error!r}")
 
     def _execute_network_request(self, network_request) -> None:
         """
@@ -651,11 +774,21 @@ class Controller(Listener):
         and then execute it.
         """
 
-        if network_request[0] == "terminate_song_data_recv":
-            self._terminate_song_data_recv_request_handler()
+        network_request_type, args, future = network_request
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            if network_request_type == "terminate_song_data_recv":
+                future.set_result(self._terminate_song_data_recv_request_handler())
+
+            elif network_request_type == "search":
+                future.set_result(self._search_request_handler(*args))
 
-        elif network_request[0] == "search":
-            self._search_request_handler(network_request[1], network_request[2])
+            else:
+                future.set_result(None)
+        except Exception as error:  # Do not leave a waiting thread blocked, and keep serving requests
+            future.set_exception(error)
+            print(f"[NETWORK REQUEST ERROR] - {network_request_type}: {error!r}")
 
     def _execute_internal_request(self, internal_request) -> None:
         """
@@ -686,24 +819,24 @@ class Controller(Listener):
         """
 
         internal_request = (internal_request_type, *args, *kwargs)
-        self._internal_request_queue.append(internal_request)
-        self._new_internal_request_flag.set()  # If the internal request loop is waiting for request, inform it
+        self._internal_request_queue.put(internal_request)  # Wakes the internal request loop if it is waiting
 
-    def _add_network_request(self, network_request_type: str, *args, **kwargs) -> None:
+    def _add_network_request(self, network_request_type: str, *args) -> Future:
         """
         Call this method to add a network request to the queue.
+        Returns a Future that resolves with the result of the request once the communication loop executed it.
         """
 
-        network_request = (network_request_type, *args, *kwargs)
-        self._network_request_queue.append(network_request)
-        self._new_network_request_flag.set()  # In case the communication loop is waiting for a new request, inform it
+        future = Future()
+        self._network_request_queue.put((network_request_type, args, future))  # Wakes the communication loop
+        return future
 
     def _search_request_handler(
         self, search_type: str, search_string: str
-    ) -> None:  # handle if search_string is empty
+    ) -> List[Song]:  # handle if search_string is empty
         """
         Call this method to search for a song in the server. The method takes a search_type ('user' or 'internal')
-        and updates the window, or sets the internal search results respectively.
+        and returns the found songs. For 'user' searches the window is updated as well.
         """
 
         search_string_serialized = "".join(search_string.split())
@@ -711,55 +844,43 @@ class Controller(Listener):
         if search_string_serialized == "":  # If empty search string, return
             if search_type == "user":
                 self._window.display_songs(results)
-            elif search_type == "internal":
-                self._set_internal_search_results(results)
-            return
+            return results
         request = f"SEARCH@{search_string_serialized}"  # Prepare the request
         request_bytes = request.encode("utf-8")
 
         length = len(request_bytes)
-        length_bytes = length.to_bytes(4, "little")
-        self.communication_tcp_send(length_bytes, 4)
-        self.communication_tcp_send(request_bytes, length)
-        number_of_songs_bytes = self.communication_tcp_recv(4)
-        number_of_songs = int.from_bytes(number_of_songs_bytes, "little")
+        length_bytes = U32.pack(length)
+        self.communication_tcp_send(length_bytes + request_bytes)  # Length prefix and request in one send
+        number_of_songs = self._communication_recv_length()
 
         if number_of_songs > 0:  # If the server gives number_of_songs > 0
-            for i in range(number_of_songs):
-                data_length_bytes = self.communication_tcp_recv(4)
-                data_length = int.from_bytes(data_length_bytes, "little")
-                serialized_song = b""
-
-                for j in range(data_length - 1):
-                    serialized_song += self.communication_tcp_recv(1024)  # Receive song
-
-                last_packet_length_bytes = self.communication_tcp_recv(4)
-                last_packet_length = int.from_bytes(
-                    last_packet_length_bytes, "little"
-                )  # Receive last packet
-                serialized_song += self.communication_tcp_recv(last_packet_length)
+            lengths_size = 4 * number_of_songs
+            lengths_view = self._get_recv_buffer(lengths_size)[:lengths_size]
+            self.communication_tcp_recv_into(lengths_view)  # Lengths of all songs
+            lengths = struct.unpack_from(f"<{number_of_songs}I", lengths_view)
+            songs_size = sum(lengths)
+            buffer = self._get_recv_buffer(songs_size)
+            self.communication_tcp_recv_into(buffer[:songs_size])  # All songs at once
+
+            offset = 0
+            for length in lengths:
                 try:
-                    current_song = pickle.loads(serialized_song)  # Unpickle song
+                    current_song = Song.from_bytes(buffer[offset:offset + length])  # Deserialize song
                     results.append(current_song)  # Add song to results
-                except pickle.PickleError:
+                except (struct.error, UnicodeDecodeError):
                     self._window.show_internal_error()
+                offset += length
 
         if search_type == "user":
             self._window.display_songs(results)
-        elif search_type == "internal":
-            self._set_internal_search_results(results)
+        return results
 
     def _terminate_song_data_recv_request_handler(self) -> None:
         """
         Call this method to send a stream terminate request to the server.
         """
 
-        network_request = "TERMINATE_SONG_DATA_RECV@"
-        network_request_bytes = network_request.encode("utf-8")
-        length = len(network_request_bytes)
-        length_bytes = length.to_bytes(4, "little")
-        self.communication_tcp_send(length_bytes, 4)
-        self.communication_tcp_send(network_request_bytes, length)
+        self.communication_tcp_send(TERMINATE_SONG_DATA_RECV_REQUEST)  # One send for the whole request
 
     def _set_slider_free(self):
         self._slider_busy = False
@@ -782,10 +903,6 @@ class Controller(Listener):
 
         # Threading Events
         self._reconnect.set()
-        self._new_network_request_flag.clear()
-        self._new_internal_request_flag.clear()
-        self._internal_search.clear()
-        self._activity_file_flag.set()
         # Threads
         self.connection_thread.start()
         self.communication_thread.start()
@@ -797,22 +914,28 @@ class Controller(Listener):
 
     def _create_controller_client(self):
         self._controller_client = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._controller_client.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self._socket_buffer_size)
+        self._controller_client.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self._socket_buffer_size)
+        self._controller_client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)  # Short requests
 
     def _connect_to_server(self):
         while True:
             self._reconnect.wait()
             self._reconnect.clear()
+            retry_delay = 0.1  # Seconds, doubled after every refused attempt up to 1 second
             self._create_controller_client()
             while True:
                 try:
                     self._controller_client.connect(
                         (self._host, self._port_communication)
                     )
-                    self.communication_tcp_send(self._client_id, 6)
+                    self.communication_tcp_send(self._client_id)
                     print("[COMMUNICATION CONNECTED]")
                     break
                 except ConnectionRefusedError:
                     print("[WAITING FOR SERVER] - [CONTROLLER]")
+                    time.sleep(retry_delay)
+                    retry_delay = min(retry_delay * 2, 1.0)
                 except OSError:
                     print("[OS ERROR]")
                     break
@@ -871,31 +994,43 @@ class Controller(Listener):
 
         self._mediaplayer.exit()
 
-    def communication_tcp_send(self, data: bytes, bufsize: int) -> None:
+    def communication_tcp_send(self, data: bytes) -> None:
         """
-        This method sends the specified data (bytes) of length bufsize(int) using socket.send().
-        If not all data was successfully sent, the method will try again to send the remaining data.
+        This method sends all the specified data (bytes) using socket.sendall().
         """
 
-        total_sent = 0
-        while total_sent < bufsize:
-            sent = self._controller_client.send(data[total_sent:])
-            if sent == 0:
-                raise RuntimeError("socket connection broken")
-            total_sent = total_sent + sent
+        self._controller_client.sendall(data)
 
-    def communication_tcp_recv(self, bufsize: int) -> bytes:
+    def communication_tcp_recv_into(self, view: memoryview) -> None:
         """
-        This method received data (bytes) of size bufsize (int) from the server. If not all data was received,
-        the method will try again to receive the remaining data.
+        This method receives data from the server directly into the given memoryview until it is full,
+        without allocating new bytes objects.
         """
 
-        chunks = []
         bytes_received = 0
-        while bytes_received < bufsize:
-            chunk = self._controller_client.recv(bufsize - bytes_received)
-            if chunk == b"":
+        size = len(view)
+        while bytes_received < size:
+            # MSG_WAITALL lets the kernel fill the whole view at once; the loop only handles short reads
+            received = self._controller_client.recv_into(view[bytes_received:], 0, RECV_FLAGS)
+            if received == 0:
                 raise RuntimeError("socket connection broken")
-            chunks.append(chunk)
-            bytes_received = bytes_received + len(chunk)
-        return b"".join(chunks)
+            bytes_received = bytes_received + received
+
+    def _communication_recv_length(self) -> int:
+        """
+        This method receives a 4-byte little-endian length from the server.
+        """
+
+        self.communication_tcp_recv_into(self._length_view)
+        return U32.unpack(self._length_view)[0]
+
+    def _get_recv_buffer(self, size: int) -> memoryview:
+        """
+        This method returns a view of the receive buffer that holds at least size bytes.
+        The buffer is replaced by a larger one if it is too small.
+        """
+
+        if size > len(self._recv_buffer):
+            self._recv_buffer = bytearray(size)
+            self._recv_view = memoryview(self._recv_buffer)
+        return self._recv_view
@@ -10,6 +10,7 @@ class Listener:
     """
 
     listeners = []
+    listeners_by_event = {}  # event_name: listeners subscribed to it, so firing does not scan every listener
 
     def __init__(self):
         self.listeners.append(self)
@@ -22,6 +23,8 @@ class Listener:
         thread.
         """
 
+        if event_name not in self.listening_for:
+            self.listeners_by_event.setdefault(event_name, []).append(self)
         self.listening_for[event_name] = callback
 
 
@@ -48,8 +51,7 @@ class Event:
         Call this method to fire the event.
         """
 
-        for listener in Listener.listeners:
-            if self.event_name in listener.listening_for:
-                listener.listening_for[self.event_name](
-                    *self.arguments, **self.kw_arguments
-                )
+        for listener in Listener.listeners_by_event.get(self.event_name, ()):
+            listener.listening_for[self.event_name](
+                *self.arguments, **self.kw_arguments
+            )
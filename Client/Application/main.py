@@ -1,6 +1,7 @@
+import sys
 from application import Application
 
 
 if __name__ == "__main__":
     application = Application()
-    application.run()
+    sys.exit(application.run())
@@ -1,10 +1,19 @@
 import socket
+import struct
 import threading
+import time
 import random
+from array import array
 import configuration
 from typing import List
 from song import Song
-from player import Player
+from player import Player, PACKET_SIZE
+
+RECV_FLAGS = getattr(socket, "MSG_WAITALL", 0)  # Not available on every platform
+U32 = struct.Struct("<I")  # Lengths and ids on the wire are 4-byte little-endian
+TYPE_DATA = b"data"  # Packet types sent by the server
+TYPE_EXIT = b"exit"
+FRAME_SIZE = 4 + PACKET_SIZE  # Packet type followed by one packet of song data
 
 
 class MediaPlayer:
@@ -30,6 +39,7 @@ class MediaPlayer:
         # CONFIGURATION
         self._host = configuration.get_host()
         self._port_streaming = configuration.get_port_streaming()
+        self._socket_buffer_size = configuration.get_socket_buffer_size()
         self._client_id = configuration.get_client_id().encode("utf-8")
         # CONFIGURATION
 
@@ -38,6 +48,7 @@ class MediaPlayer:
         self._queue = SongQueue()  # Stores Song objects
         self._create_stream_client()
         self._current_song_index = 0
+        self._current_duration = 0  # Duration of the song at the current index, read by the progress callback
         self._repeat_state = 0
         self._shuffle_state = 0
         self._connected = None
@@ -99,8 +110,7 @@ class MediaPlayer:
 
     @staticmethod
     def _seconds_to_string(seconds: int) -> str:
-        minutes = int(seconds / 60)
-        seconds = int(seconds % 60)
+        minutes, seconds = divmod(int(seconds), 60)
         return f"{minutes:0>2d}:{seconds:0>2d}"
 
     def _send_progress(self, progress: int) -> None:  # Send progress and minutes
@@ -109,8 +119,7 @@ class MediaPlayer:
         info: time_passed (string). Progress must be between 0 - 1000.
         """
 
-        duration_sec = self._queue[self._current_song_index].duration
-        current_time_sec = duration_sec * (progress / 1000)
+        current_time_sec = self._current_duration * (progress / 1000)
         time_passed_string = MediaPlayer._seconds_to_string(current_time_sec)
         self.send_progress_info(progress, time_passed_string)
 
@@ -147,26 +156,35 @@ class MediaPlayer:
         self._player.exit_stream_loop()
         self._player.terminate_stream()
         self._currently_streaming.wait()
+        if self.song_thread.is_alive():
+            self.song_thread.join()
+        self._player.close()
         self._stream_client.close()
 
     def _create_stream_client(self) -> None:
         self._stream_client = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._stream_client.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self._socket_buffer_size)
+        self._stream_client.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self._socket_buffer_size)
+        self._stream_client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)  # Song requests are 4 bytes
 
     def _connect_to_server(self) -> None:
         while True:
             self._reconnect.wait()
             self._reconnect.clear()
+            retry_delay = 0.1  # Seconds, doubled after every refused attempt up to 1 second
             self._create_stream_client()
             while True:
                 try:
                     self._connected = False
                     self._stream_client.connect((self._host, self._port_streaming))
-                    self.streaming_tcp_send(self._client_id, 6)
+                    self.streaming_tcp_send(self._client_id)
                     self._connected = True
                     print("[STREAMING CONNECTED]")
                     break
                 except ConnectionRefusedError:
                     print("[WAITING FOR SERVER] - [STREAM]")
+                    time.sleep(retry_delay)
+                    retry_delay = min(retry_delay * 2, 1.0)
                 except OSError:
                     break
 
@@ -180,12 +198,8 @@ class MediaPlayer:
             self._next_index.clear()
 
     def _current_song_update(self) -> None:
-        song_name = self._queue[self._current_song_index].song_name
-        artist_name = self._queue[self._current_song_index].artist_name
-        duration_string = self._queue[self._current_song_index].duration_string
-        image_binary = self._queue[self._current_song_index].image_binary
-        song = self._queue[self._current_song_index]
-        self.send_current_song_update(song_name, artist_name, duration_string, image_binary, song)
+        song = self._queue.songs[self._current_song_index]
+        self.send_current_song_update(song.song_name, song.artist_name, song.duration_string, song.image_binary, song)
 
     def display_queue(self, self_display=False) -> None:
         """
@@ -193,15 +207,14 @@ class MediaPlayer:
         is called from an automated function - fixes race condition problems.
         """
 
-        results = []  # Store songs to be displayed
         if (
             not self._currently_streaming.is_set() or self_display
         ):  # If streaming or calling from 'start_song'
             start = self._current_song_index + 1
         else:
             start = self._current_song_index
-        for song_index in range(start, len(self._queue)):
-            results.append((self._queue[song_index], song_index))
+        songs = self._queue.songs
+        results = [(songs[song_index], song_index) for song_index in range(start, len(songs))]  # Songs to display
         self.send_queue_info(results)  # Send the results to window
 
     def remove_from_queue(self, song_index: int) -> None:
@@ -227,8 +240,7 @@ class MediaPlayer:
         self._currently_streaming.wait()
         self._queue.clear_queue()
         self._current_song_index = 0
-        for song in playlist_songs:
-            self._queue.append_to_queue(song)
+        self._queue.extend_queue(playlist_songs)
         if self._shuffle_state == 1:
             self._queue.shuffle(self._current_song_index)
         if self._repeat_state == 2:
@@ -256,8 +268,7 @@ class MediaPlayer:
         Adds a list of songs to the queue.
         """
 
-        for song in playlist_songs:
-            self._queue.append_to_queue(song)
+        self._queue.extend_queue(playlist_songs)
         self.display_queue()
 
     def move_up(self, song_index: int) -> None:
@@ -302,9 +313,11 @@ class MediaPlayer:
             self._player.terminate_stream()  # Request stream termination
             self._currently_streaming.wait()  # Wait for the stream to fully terminate
             try:  # If streaming is disconnected -> Reconnect
-                request_song_id = self._queue[self._current_song_index].song_id
-                request_song_id_bytes = request_song_id.to_bytes(4, "little")
-                self.streaming_tcp_send(request_song_id_bytes, 4)
+                current_song = self._queue.songs[self._current_song_index]
+                self._current_duration = current_song.duration
+                request_song_id = current_song.song_id
+                request_song_id_bytes = U32.pack(request_song_id)
+                self.streaming_tcp_send(request_song_id_bytes)
                 self._start_read()  # Start reading from server
                 self._player.start_stream()  # Start streaming song
                 self._current_song_update()  # Update the current song in window
@@ -414,58 +427,62 @@ class MediaPlayer:
             self._start_read_flag.wait()
             self._currently_reading.clear()
             self._start_read_flag.clear()
-            type_data = "data".encode("utf-8")
-            type_exit = "exit".encode("utf-8")
-
             try:
                 song_data_length_bytes = self.streaming_tcp_recv(4)
-                song_data_length = int.from_bytes(song_data_length_bytes, "little")
+                (song_data_length,) = U32.unpack(song_data_length_bytes)
                 self._player.set_song_data_length(song_data_length)
+                frame = bytearray(FRAME_SIZE)  # Reused for every frame of the song
+                frame_view = memoryview(frame)
+                packet = frame_view[4:]
                 for i in range(song_data_length):
-                    current_type = self.streaming_tcp_recv(4)
-                    if current_type == type_data:
-                        current_packet = self.streaming_tcp_recv(4096)
-                        self._player.receive_packet(current_packet)
-                    elif current_type == type_exit:
+                    self.streaming_tcp_recv_into(frame_view)  # Type and packet in one read
+                    if frame.startswith(TYPE_DATA):
+                        self._player.receive_packet(packet)  # Copied into the player's buffer
+                    elif frame.startswith(TYPE_EXIT):
                         break
 
             except ConnectionResetError:
                 self._reconnect.set()
             finally:
-                self._player.receive_packet("END_OF_FILE".encode("utf-8"))
+                self._player.end_of_data()
                 self._currently_reading.set()
 
-    def streaming_tcp_send(self, data: bytes, bufsize: int) -> None:
+    def streaming_tcp_send(self, data: bytes) -> None:
         """
-        This method sends the specified data (bytes) of length bufsize(int) using socket.send().
-        If not all data was successfully sent, the method will try again to send the remaining data.
+        This method sends all the specified data (bytes) using socket.sendall().
         """
 
-        total_sent = 0
-        while total_sent < bufsize:
-            sent = self._stream_client.send(data[total_sent:])
-            if sent == 0:
-                raise RuntimeError("socket connection broken")
-            total_sent = total_sent + sent
+        self._stream_client.sendall(data)
 
-    def streaming_tcp_recv(self, bufsize: int) -> bytes:
+    def streaming_tcp_recv(self, bufsize: int) -> bytearray:
         """
         This method received data (bytes) of size bufsize (int) from the server. If not all data was received,
         the method will try again to receive the remaining data.
+        The data is received directly into a new bytearray, which the caller owns.
+        """
+
+        data = bytearray(bufsize)
+        self.streaming_tcp_recv_into(memoryview(data))
+        return data
+
+    def streaming_tcp_recv_into(self, view: memoryview) -> None:
+        """
+        This method fills the writable view with data received from the server, trying again until it is full.
         """
 
-        chunks = []
+        bufsize = len(view)
         bytes_received = 0
         while bytes_received < bufsize:
-            chunk = self._stream_client.recv(bufsize - bytes_received)
-            if chunk == b"":
+            # MSG_WAITALL lets the kernel fill the whole view at once; the loop only handles short reads
+            received = self._stream_client.recv_into(view[bytes_received:], 0, RECV_FLAGS)
+            if received == 0:
                 raise RuntimeError("socket connection broken")
-            chunks.append(chunk)
-            bytes_received = bytes_received + len(chunk)
-        return b"".join(chunks)
+            bytes_received = bytes_received + received
 
 
 class SongQueue:
+    __slots__ = ('_queue', '_ordered_queue')
+
     def __init__(self):
         """
         Summary:
@@ -481,11 +498,19 @@ class SongQueue:
         """
 
         self._queue = []  # Store songs
-        self._ordered_queue = []  # Store ordered song_ids
+        self._ordered_queue = array("I")  # Store ordered song_ids
 
     def __getitem__(self, key: int):
         return self._queue[key]
 
+    @property
+    def songs(self) -> List[Song]:
+        """
+        The internal list of songs in queue order. Use it for direct indexing in frequently called code.
+        """
+
+        return self._queue
+
     def __setitem__(self, key: int, new_value) -> None:
         self._queue[key] = new_value
 
@@ -504,7 +529,7 @@ class SongQueue:
         """
 
         self._queue.clear()
-        self._ordered_queue.clear()
+        del self._ordered_queue[:]
 
     def insert_to_queue(self, index: int, song: Song) -> None:
         """
@@ -512,7 +537,7 @@ class SongQueue:
         """
 
         self._queue.insert(index, song)
-        self._ordered_queue.insert(index, song)
+        self._ordered_queue.insert(index, song.song_id)
 
     def pop_from_queue(self, index=-1) -> None:
         """
@@ -530,19 +555,26 @@ class SongQueue:
         self._queue.append(song)
         self._ordered_queue.append(song.song_id)
 
+    def extend_queue(self, songs: List[Song]) -> None:
+        """
+        Append a list of song objects to queue and ordered queue.
+        """
+
+        self._queue.extend(songs)
+        self._ordered_queue.extend(song.song_id for song in songs)
+
     def shuffle(self, current_song_index: int) -> None:
         """
         Call this method to shuffle the queue. The current song element is not changed.
         """
 
         if self._queue:
-            # Generate a random number excluding current song index.
-            r = list(range(0, current_song_index)) + list(range(current_song_index + 1, len(self)))
-            for i in range(len(self)):
-                if i != current_song_index:
-                    random_number = random.choice(r)
-                    # Shuffle queue
-                    self._queue[i], self._queue[random_number] = self._queue[random_number], self._queue[i]
+            # Shuffle every song except the current one, then put the current song back in its place
+            current_song = self._queue[current_song_index]
+            rest = self._queue[:current_song_index] + self._queue[current_song_index + 1:]
+            random.shuffle(rest)
+            rest.insert(current_song_index, current_song)
+            self._queue[:] = rest
 
     def unshuffle(self, current_song_index: int) -> None:
         """
@@ -552,12 +584,13 @@ class SongQueue:
         """
 
         if self._queue:
+            positions = {}  # song_id -> index in the queue, first occurrence
+            for index in range(len(self._queue) - 1, -1, -1):
+                positions[self._queue[index].song_id] = index
             for i in range(0, len(self)):
-                ordered_index = next(
-                    index
-                    for index, value in enumerate(self._queue)
-                    if value.song_id == self._ordered_queue[i]
-                )
+                ordered_index = positions[self._ordered_queue[i]]
                 if i != current_song_index and ordered_index != current_song_index:
                     # Unshuffle queue
                     self._queue[i], self._queue[ordered_index] = self._queue[ordered_index], self._queue[i],
+                    positions[self._queue[i].song_id] = i
+                    positions[self._queue[ordered_index].song_id] = ordered_index
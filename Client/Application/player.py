@@ -1,6 +1,11 @@
+import mmap
 import pyaudio
+import tempfile
 import threading
-import time
+
+PACKET_SIZE = 4096  # Bytes of wav data in one packet
+BLOCK_PACKETS = 4  # Packets handed to pyaudio in one write
+BLOCK_SIZE = BLOCK_PACKETS * PACKET_SIZE
 
 
 class Player:
@@ -12,37 +17,89 @@ class Player:
     Usage:
     To use this class you must create an object and call its stream_loop() method in a separate thread.
     Use receive_packet(packet) to feed data into the internal buffer. Data must be binary wav.
+    Call end_of_data() once the last packet of a song has been received.
+    Call close() when the player is no longer needed, or use the player as a context manager.
     """
 
+    # One PortAudio session is shared by all players and terminated when the last player closes
+    _shared_pa = None
+    _shared_pa_count = 0
+    _shared_pa_lock = threading.Lock()
+
     def __init__(self, progress_callback=lambda progress: None):
         # ATTRIBUTES
-        self._pa = pyaudio.PyAudio()
+        self._pa = self._acquire_pyaudio()
         self._stream = self._create_stream()
-        self._song_data = []
+        self._song_file = None  # Temporary file backing _song_data
+        self._song_data = bytearray()  # Packets of the current song, back to back; a file-backed mmap once reserved
+        self._song_data_view = memoryview(self._song_data)
+        self._song_data_lock = threading.Lock()  # Held while the buffer is replaced, written or copied from
+        self._closed = False  # Set by close(); the buffer is released and packets are ignored
+        self._packets_received = 0
+        self._end_of_data = False
         self._song_data_length = 0
         self._current_index = 0
         self._last_index = 0
+        self._tick_stride = 1  # Packets between two progress updates
+        self._next_tick_index = 0
         self._stop = False
+        self._paused = True  # Read on every packet; changed under _pause_condition
         self._stream_has_started = False
         self._stream_loop_continue = True
         self._end_of_stream_event = None
         self._terminate_stream_event = None
-        self._STOP_CONDITION = "END_OF_FILE".encode("utf-8")
         # ATTRIBUTES
 
         # THREADING EVENTS
-        self._play_pause = threading.Event()
+        self._pause_condition = threading.Condition()  # Wakes the stream when it is unpaused or stopped
         self._start_stream_flag = threading.Event()
         self._start_stream_flag.clear()
+        self._data_available = threading.Event()  # Set by the receiver when the buffer has grown or ended
         # THREADING EVENTS
 
         # CALLBACKS
         self.send_progress = progress_callback
         # CALLBACKS
 
-    def __del__(self) -> None:
+    def __enter__(self) -> "Player":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Closes the stream and releases pyaudio. Call it once stream_loop() has exited. Closing twice does nothing.
+        """
+
+        if self._pa is None:
+            return
+        self._stream.stop_stream()
         self._stream.close()
-        self._pa.terminate()
+        self._pa = None
+        self._release_pyaudio()
+        with self._song_data_lock:  # The reader thread may still be feeding packets
+            self._closed = True
+            self._song_data_view.release()
+            if self._song_file is not None:
+                self._song_data.close()
+                self._song_file.close()
+
+    @classmethod
+    def _acquire_pyaudio(cls) -> pyaudio.PyAudio:
+        with cls._shared_pa_lock:
+            if cls._shared_pa is None:
+                cls._shared_pa = pyaudio.PyAudio()
+            cls._shared_pa_count += 1
+            return cls._shared_pa
+
+    @classmethod
+    def _release_pyaudio(cls) -> None:
+        with cls._shared_pa_lock:
+            cls._shared_pa_count -= 1
+            if cls._shared_pa_count == 0:
+                cls._shared_pa.terminate()
+                cls._shared_pa = None
 
     def _create_stream(self) -> pyaudio.Stream:
         """
@@ -55,6 +112,7 @@ class Player:
             channels=2,
             rate=48000,
             output=True,
+            frames_per_buffer=BLOCK_SIZE // 4,  # 2 channels of 2 bytes per frame
         )
         return _stream
 
@@ -68,32 +126,58 @@ class Player:
 
     def set_song_data_length(self, length: int) -> None:
         """
-        This method takes length and assigns it to the song buffer.
+        This method takes length (number of packets) and assigns it to the song buffer.
+        The buffer is only reallocated if it is too small for the song.
         """
 
         self._song_data_length = length
         self._last_index = self._song_data_length - 1
+        self._tick_stride = max(1, self._last_index // 1000)  # Progress has only 1000 distinct values
+        with self._song_data_lock:
+            if not self._closed:
+                self._reserve(length * PACKET_SIZE)
+
+    def _reserve(self, size: int) -> None:
+        """
+        Makes sure the song buffer holds at least size bytes. Received packets are kept.
+        The buffer is mapped from one temporary file, so the OS can page it out instead of keeping it resident.
+        Growing it enlarges the file and maps it again; the packets already in the file are not copied.
+        Call it while holding _song_data_lock.
+        """
+
+        if len(self._song_data) < size:
+            self._song_data_view.release()
+            if self._song_file is None:
+                self._song_file = tempfile.TemporaryFile()
+            else:
+                self._song_data.close()  # A mapped file cannot be resized on every platform
+            self._song_file.truncate(size)
+            self._song_data = mmap.mmap(self._song_file.fileno(), size)
+            self._song_data_view = memoryview(self._song_data)
 
     def pause(self) -> None:
         """
         Call this method to pause the music.
         """
 
-        self._play_pause.clear()
+        with self._pause_condition:
+            self._paused = True
 
     def play(self) -> None:
         """
         Call this method to unpause the music.
         """
 
-        self._play_pause.set()
+        with self._pause_condition:
+            self._paused = False
+            self._pause_condition.notify_all()
 
     def get_play_state(self) -> bool:
         """
         This method will return the play/ pause state. True for play and False for pause.
         """
 
-        return self._play_pause.is_set()
+        return not self._paused
 
     def change_play_state(self) -> bool:
         """
@@ -103,11 +187,10 @@ class Player:
         Returns the state after the change. True for play and False for pause.
         """
 
-        if self._play_pause.is_set():
-            self._play_pause.clear()
-        else:
-            self._play_pause.set()
-        return self._play_pause.is_set()
+        with self._pause_condition:
+            self._paused = not self._paused
+            self._pause_condition.notify_all()
+            return not self._paused
 
     def set_progress(self, value: int) -> None:
         """
@@ -115,31 +198,48 @@ class Player:
         1000 for the end.
         """
 
-        if value < 0:
-            value = 0
-        elif value > 1000:
-            value = 1000
-
-        index_from_percent = round(((value / 1000) * (self._song_data_length - 1)))
-        if index_from_percent < 0:
-            index_from_percent = 0
+        value = 0 if value < 0 else 1000 if value > 1000 else value
+        # Integer math rounding half to even, the same positions as round(value / 1000 * last_index)
+        index_from_percent, remainder = divmod(value * max(0, self._last_index), 1000)
+        if remainder > 500 or (remainder == 500 and index_from_percent % 2):
+            index_from_percent += 1
         self._current_index = index_from_percent
+        self._next_tick_index = index_from_percent  # Report the new position with the next packet
 
     def receive_packet(self, packet: bytes) -> None:
         """
-        Call this method to feed the player's buffer with data. Packet must be binary wav.
+        Call this method to feed the player's buffer with data. Packet must be PACKET_SIZE bytes of binary wav.
+        The packet is copied into the buffer, so the caller may reuse it. After close() packets are ignored.
+        """
+
+        with self._song_data_lock:
+            if self._closed:
+                return
+            offset = self._packets_received * PACKET_SIZE
+            if offset + PACKET_SIZE > len(self._song_data):  # Length not set yet; grow geometrically
+                self._reserve(max(offset + PACKET_SIZE, 2 * len(self._song_data)))
+            self._song_data_view[offset:offset + PACKET_SIZE] = packet
+            self._packets_received += 1
+        self._data_available.set()
+
+    def end_of_data(self) -> None:
+        """
+        Call this method after the last packet of the song has been received.
         """
 
-        self._song_data.append(packet)
+        self._end_of_data = True
+        self._data_available.set()
 
     def _set_start_conditions(self) -> None:
         self._stream_has_started = True
         self._stop = False
-        self._play_pause.set()
+        self.play()
         self._current_index = 0
+        self._next_tick_index = 0
 
     def _set_end_conditions(self) -> None:
-        self._song_data.clear()
+        self._packets_received = 0
+        self._end_of_data = False
         self._stream_has_started = False
         self._current_index = 0
         self._terminate_stream_event.set()
@@ -166,7 +266,7 @@ class Player:
 
         self._terminate_stream_event.clear()
         self._start_stream_flag.set()
-        self._play_pause.set()
+        self.play()
 
     def terminate_stream(self) -> None:
         """
@@ -176,7 +276,8 @@ class Player:
         """
 
         self._stop = True
-        self._play_pause.set()  # Let start_stream end execution; solve Pause -> Terminate problem
+        self.play()  # Let start_stream end execution; solve Pause -> Terminate problem
+        self._data_available.set()  # Wake the stream if it is waiting for data
 
     def stream_loop(self) -> None:
         """
@@ -185,8 +286,8 @@ class Player:
         Use start_stream() to start a stream.
         Use terminate_stream() to terminate a stream.
         Use receive_packet() to feed data to the buffer.
-        If the data is not feed until the stream has reached the last packet, the stream will wait for 0.01 sec
-        until it tries to read data again.
+        If the data is not fed until the stream has reached the last packet, the stream waits until
+        receive_packet() or end_of_data() is called.
         Changing hardware output in your computer will create a new pyaudio stream.
         """
 
@@ -195,30 +296,52 @@ class Player:
             self._start_stream_flag.clear()
             self._set_start_conditions()
             end = False
-            _previous_progress = -1
             if not self._stream_loop_continue:
                 break
+            # Bound once per stream; the song buffer and its length may still change while it plays
+            send_progress = self.send_progress
+            pause_condition = self._pause_condition
+            data_available = self._data_available
+            song_data_lock = self._song_data_lock
             while True:
+                write = self._stream.write  # Bound again after the stream is recreated
                 try:
-                    while (
-                        not self._stop
-                        and self._song_data[self._current_index] != self._STOP_CONDITION
-                    ):
-                        # Play music
-                        self._stream.write(self._song_data[self._current_index])
+                    while not self._stop:
+                        end_of_data = self._end_of_data  # Read before the packet count, which is final once set
+                        if self._current_index >= self._packets_received:
+                            if end_of_data:
+                                if self._current_index > 0:  # The song has been played to the end
+                                    self._end_of_stream_event.set()
+                                break
+                            # receive_packet() is not receiving data enough quickly. Wait for the next packet.
+                            data_available.clear()
+                            if (
+                                self._current_index >= self._packets_received
+                                and not self._end_of_data
+                                and not self._stop
+                            ):
+                                data_available.wait()
+                            continue
+                        # Play music; up to BLOCK_PACKETS received packets in one write
+                        index = self._current_index
+                        count = min(BLOCK_PACKETS, self._packets_received - index)
+                        offset = index * PACKET_SIZE
+                        with song_data_lock:  # receive_packet() may replace the buffer meanwhile
+                            block = bytes(self._song_data_view[offset:offset + count * PACKET_SIZE])
+                        write(block)
                         # Calculate progress
-                        progress_from_index = round(((self._current_index * 1000) / self._last_index))
-                        if progress_from_index != _previous_progress:
-                            self.send_progress(progress_from_index)
-                            _previous_progress = progress_from_index
+                        last_written = index + count - 1
+                        last_index = self._last_index
+                        if last_written >= self._next_tick_index or last_written == last_index:
+                            send_progress(last_written * 1000 // max(1, last_index))
+                            self._next_tick_index = last_written + self._tick_stride
                         # Play-Pause
-                        self._play_pause.wait()
-                        self._current_index += 1
-                        if self._song_data[self._current_index] == self._STOP_CONDITION:
-                            self._end_of_stream_event.set()
+                        if self._paused:
+                            with pause_condition:
+                                pause_condition.wait_for(lambda: not self._paused or self._stop)
+                        if self._current_index == index:  # Not moved by set_progress() meanwhile
+                            self._current_index = index + count
                     end = True
-                except IndexError:  # receive_packet() is not receiving data enough quickly. Wait.
-                    time.sleep(0.01)
                 except OSError:  # Different Audio Hardware
                     self._stream = self._create_stream()
                 finally:
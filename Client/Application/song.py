@@ -1,8 +1,17 @@
+import struct
+
+# song_id, song name length, artist name length, duration, image length (little-endian)
+SONG_HEADER = struct.Struct("<IHHII")
+_TWO_DIGITS = [f"{number:02d}" for number in range(100)]  # "00" - "99"
+
+
 class Song:
     """
     This class represents a song. It contains the data of a song.
     """
 
+    __slots__ = ('song_id', 'song_name', 'artist_name', 'duration', 'duration_string', 'image_binary')
+
     def __init__(self, song_id: int, song_name: str, artist_name: str, duration: int, image_binary: bytes):
         self.song_id = song_id
         self.song_name = song_name
@@ -11,20 +20,52 @@ class Song:
         self.duration_string = self._seconds_to_string(duration)
         self.image_binary = image_binary
 
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Song":
+        """
+        Creates a song from data serialized by the server: SONG_HEADER followed by the UTF-8 song name,
+        the UTF-8 artist name and the image.
+        """
+
+        song_id, song_name_length, artist_name_length, duration, image_length = SONG_HEADER.unpack_from(data)
+        view = memoryview(data)
+        artist_name_offset = SONG_HEADER.size + song_name_length
+        image_offset = artist_name_offset + artist_name_length
+        song_name = str(view[SONG_HEADER.size:artist_name_offset], "utf-8")
+        artist_name = str(view[artist_name_offset:image_offset], "utf-8")
+        image_binary = bytes(view[image_offset:image_offset + image_length])
+        return cls(song_id, song_name, artist_name, duration, image_binary)
+
     @staticmethod
     def _seconds_to_string(seconds):
         """Converts seconds to minute and seconds (00:00)"""
-        minutes = int(seconds / 60)
-        seconds = int(seconds % 60)
+        minutes, seconds = divmod(int(seconds), 60)
+        if minutes < 100:
+            return _TWO_DIGITS[minutes] + ":" + _TWO_DIGITS[seconds]
         return f"{minutes:0>2d}:{seconds:0>2d}"
 
     def __str__(self):
-        return (
-            str(self.song_id)
-            + ", "
-            + self.song_name
-            + ", "
-            + self.artist_name
-            + ", "
-            + str(self.duration)
-        )
+        return f"{self.song_id}, {self.song_name}, {self.artist_name}, {self.duration}"
+
+
+class LazyImageSong(Song):
+    """
+    This class represents a song whose image is loaded only when image_binary is first read.
+    Pass a callable that returns the image bytes instead of the bytes themselves.
+    """
+
+    __slots__ = ('_image_loader', '_image_binary')
+
+    def __init__(self, song_id: int, song_name: str, artist_name: str, duration: int, image_loader):
+        Song.__init__(self, song_id, song_name, artist_name, duration, None)
+        self._image_loader = image_loader
+
+    @property
+    def image_binary(self) -> bytes:
+        if self._image_binary is None:
+            self._image_binary = self._image_loader()
+        return self._image_binary
+
+    @image_binary.setter
+    def image_binary(self, image_binary: bytes) -> None:
+        self._image_binary = image_binary
@@ -1,4 +1,10 @@
+import base64
+import csv
+import pathlib
+import tempfile
 import unittest
+from collections import deque
+from unittest import mock
 import pyaudio
 import player
 import mediaplayer
@@ -7,13 +13,28 @@ import eventsystem
 import song
 
 
-class TestPLayer(unittest.TestCase):
+class TestPlayerStream(unittest.TestCase):
     def setUp(self) -> None:
         self.player = player.Player()
 
+    def tearDown(self) -> None:
+        self.player.close()
+
     def test_create_stream(self):
         self.assertIsInstance(self.player._create_stream(), pyaudio.Stream)
 
+
+class TestPLayer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        # The progress tests need no audio device; one player with a mocked pyaudio serves all of them
+        with mock.patch('player.pyaudio'):
+            cls.player = player.Player()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.player.close()
+
     def test_set_progress_valid_value_0(self):
         self.player.set_song_data_length(50)
         self.player.set_progress(0)
@@ -24,6 +45,11 @@ class TestPLayer(unittest.TestCase):
         self.player.set_progress(500)
         self.assertEqual(24, self.player._current_index)
 
+    def test_set_progress_valid_value_999(self):
+        self.player.set_song_data_length(50)
+        self.player.set_progress(999)
+        self.assertEqual(49, self.player._current_index)
+
     def test_set_progress_valid_value_1000(self):
         self.player.set_song_data_length(50)
         self.player.set_progress(1000)
@@ -107,6 +133,16 @@ class TestSongQueue(unittest.TestCase):
         self.song_queue.shuffle(0)
         self.assertEqual(self.song_queue[0], self.test_song_1)
 
+    def test_extend_queue(self):
+        test_song_4 = song.Song(4, 'Collide', 'Elektronomia', 222, b'test')
+        test_song_5 = song.Song(5, 'Aero Chord', 'Surface', 210, b'test')
+        self.song_queue.extend_queue([test_song_4, test_song_5])
+        self.assertEqual(len(self.song_queue), 5)
+        self.assertEqual(self.song_queue[3], test_song_4)
+        self.song_queue.shuffle(0)
+        self.song_queue.unshuffle(0)
+        self.assertEqual(self.song_queue[3], test_song_4)
+
     def test_unshuffle(self):
         self.song_queue.shuffle(0)
         self.song_queue.unshuffle(0)
@@ -125,13 +161,15 @@ class TestController(unittest.TestCase):
                      ['3', 'Collide', 'Elektronomia', '222', ''],
                      ['4', 'Whatever', 'Cartoon', '205', '']]
 
-        artist_data = [{'artist': 'Cartoon', 'count': 10},
-                       {'artist': 'TheFatRat', 'count': 9},
-                       {'artist': 'Elektronomia', 'count': 8},
-                       {'artist': 'Cartoon', 'count': 7}]
+        artist_data = deque([{'artist': 'Cartoon', 'count': 10},
+                             {'artist': 'TheFatRat', 'count': 9},
+                             {'artist': 'Elektronomia', 'count': 8},
+                             {'artist': 'Cartoon', 'count': 7}])
+        artist_index = self.controller._build_artist_index(song_data)
         for i in range(1, 5):
-            result_song_data, result_artist_data, song = self.controller._priority_first(song_data, artist_data)
+            song = self.controller._priority_first(song_data, artist_data, artist_index)
             self.assertEqual(i, song.song_id)
+        self.assertEqual(artist_data, deque())
 
     def test_priority_first_no_result(self):
         song_data = [['1', 'On & On', 'Cartoon', '207', ''],
@@ -139,21 +177,22 @@ class TestController(unittest.TestCase):
                      ['3', 'Collide', 'Elektronomia', '222', ''],
                      ['4', 'Whatever', 'Cartoon', '205', '']]
 
-        artist_data = [{'artist': 'X', 'count': 10},
-                       {'artist': 'X', 'count': 9},
-                       {'artist': 'X', 'count': 8},
-                       {'artist': 'X', 'count': 7}]
-        result_song_data_after, result_artist_data_after, song = self.controller._priority_first(song_data, artist_data)
-        self.assertListEqual(result_song_data_after, song_data)
-        self.assertListEqual(result_artist_data_after, artist_data)
+        artist_data = deque([{'artist': 'X', 'count': 10},
+                             {'artist': 'X', 'count': 9},
+                             {'artist': 'X', 'count': 8},
+                             {'artist': 'X', 'count': 7}])
+        artist_data_before = artist_data.copy()
+        artist_index = self.controller._build_artist_index(song_data)
+        song = self.controller._priority_first(song_data, artist_data, artist_index)
+        self.assertEqual(artist_data_before, artist_data)
         self.assertIsNone(song)
 
     def test_priority_first_no_input_data(self):
         song_data = []
-        artist_data = []
-        result_song_data_after, result_artist_data_after, song = self.controller._priority_first(song_data, artist_data)
-        self.assertEqual(result_song_data_after, song_data)
-        self.assertEqual(result_artist_data_after, artist_data)
+        artist_data = deque()
+        artist_index = self.controller._build_artist_index(song_data)
+        song = self.controller._priority_first(song_data, artist_data, artist_index)
+        self.assertEqual(artist_data, deque())
         self.assertIsNone(song)
 
     def test_priority_second(self):
@@ -163,10 +202,44 @@ class TestController(unittest.TestCase):
                      ['4', 'Whatever', 'Cartoon', '205', '']]
 
         artist = {'artist': 'Cartoon', 'count': 10}
+        artist_index = self.controller._build_artist_index(song_data)
 
         for i in range(1, 5):
-            song_data, song = self.controller._priority_second(song_data, artist)
+            song = self.controller._priority_second(song_data, artist, artist_index)
             self.assertEqual(i, song.song_id)
+        self.assertIsNone(self.controller._priority_second(song_data, artist, artist_index))
+
+    def test_build_trigram_index(self):
+        index = [('onandon', 'cartoon', None),
+                 ('collide', 'elektronomia', None)]
+        trigrams = self.controller._build_trigram_index(index)
+        self.assertSetEqual(trigrams['too'], {0})
+        self.assertSetEqual(trigrams['oll'], {1})
+        self.assertSetEqual(trigrams['and'], {0})
+        self.assertNotIn('nca', trigrams)
+
+    def test_import_history_csv(self):
+        with tempfile.TemporaryDirectory() as directory:
+            self.controller._history_path = pathlib.Path(directory) / 'history.db'
+            with open(pathlib.Path(directory) / 'history.csv', 'w', newline='') as csv_file:
+                csv_writer = csv.writer(csv_file)
+                csv_writer.writerow([1, 'On & On', 'Cartoon', 207, base64.b64encode(b'image').decode(), 3])
+                csv_writer.writerow([2, 'Xenogenesis', 'TheFatRat', 233, '', 1])
+            history_db = self.controller._get_history_db()
+            rows = history_db.execute("SELECT song_id, image, count FROM songs ORDER BY song_id").fetchall()
+            history_db.close()
+        self.assertEqual([(1, b'image', 3), (2, b'', 1)], rows)
+
+
+class TestSong(unittest.TestCase):
+    def test_from_bytes(self):
+        data = song.SONG_HEADER.pack(7, 4, 6, 185, 5) + b"NameArtistIMAGE"
+        current_song = song.Song.from_bytes(data)
+        self.assertEqual(current_song.song_id, 7)
+        self.assertEqual(current_song.song_name, "Name")
+        self.assertEqual(current_song.artist_name, "Artist")
+        self.assertEqual(current_song.duration, 185)
+        self.assertEqual(current_song.image_binary, b"IMAGE")
 
 
 class ListenerClass(eventsystem.Listener):
@@ -1,8 +1,14 @@
-from typing import List
+import threading
+from functools import lru_cache
+from typing import Dict, List, Tuple
 from PyQt5 import QtGui
 from PyQt5.QtCore import (
+    QAbstractListModel,
     QCoreApplication,
+    QEvent,
+    QModelIndex,
     QObject,
+    QPoint,
     QRect,
     QSize,
     Qt,
@@ -10,6 +16,11 @@ from PyQt5.QtCore import (
     pyqtSlot,
 )
 from PyQt5.QtWidgets import (
+    QAbstractItemView,
+    QAction,
+    QListView,
+    QStyledItemDelegate,
+    QStyleOptionViewItem,
     QToolButton,
     QFrame,
     QLabel,
@@ -28,10 +39,136 @@ from PyQt5.QtWidgets import (
     QStackedWidget,
 )
 from PyQt5 import QtCore, sip
-from PyQt5.QtGui import QCursor, QFont, QIcon
+from PyQt5.QtGui import QColor, QCursor, QFont, QIcon, QImage, QPainter, QPixmap
 from eventsystem import Listener, Event
 from song import Song
 
+# Style sheets shared by the song containers
+STYLE_MENU = """QMenu {background-color: rgb(60, 60, 60); color: white;}
+    QMenu::item:selected {background-color: rgb(100, 100, 100);}"""
+STYLE_WHITE_TEXT = "background-color: transparent; color: white;"
+STYLE_ARTIST_NAME = "background-color: transparent; color: rgb(85, 255, 255);"
+# Parsed once per playlist link; activating it only switches the active property
+STYLE_PLAYLIST_LINK = """PlaylistLinkContainer {background-color: rgb(35, 35, 35); color: white; border-radius: 5px;
+    border: 0px solid rgb(0, 170, 127);}
+    PlaylistLinkContainer[active="true"] {border: 1px solid rgb(0, 170, 127);}"""
+# Parsed once per playlist row; hovering only switches the hover property
+STYLE_PLAYLIST_ROW = """* {background-color: transparent; border-radius: 6px;}
+    SongPlaylistContainer[hover="true"] {background-color: rgb(60, 10, 60);}"""
+# Colors of the song rows that paint their image and names directly
+COLOR_SONG_IMAGE = QColor(85, 85, 127)
+COLOR_ARTIST_NAME = QColor(85, 255, 255)
+TEXT_FLAGS = Qt.AlignLeft | Qt.AlignVCenter  # Same alignment as a QLabel
+
+# Sizes and geometries shared by every song container and queue row
+SIZE_ICON_SMALL = QSize(15, 15)
+SIZE_ICON_MEDIUM = QSize(20, 20)
+RECT_MORE = QRect(420, 13, 36, 36)
+RECT_RECOMMENDATION_MENU = QRect(420, 130, 36, 36)
+RECT_RECOMMENDATION_IMAGE = QRect(1, 1, 148, 148)
+RECT_RECOMMENDATION_SONG_NAME = QRect(2, 151, 146, 16)
+RECT_RECOMMENDATION_ARTIST_NAME = QRect(2, 168, 146, 16)
+RECT_RECOMMENDATION_PLAY = QRect(6, 110, 34, 34)
+RECT_SEARCH_IMAGE = QRect(1, 1, 60, 60)
+RECT_SEARCH_SONG_NAME = QRect(70, 5, 300, 24)
+RECT_SEARCH_ARTIST_NAME = QRect(70, 33, 300, 24)
+RECT_SEARCH_PLAY = QRect(380, 13, 36, 36)
+RECT_PLAYLIST_IMAGE = QRect(44, 1, 44, 44)
+RECT_PLAYLIST_SONG_NAME = QRect(94, 2, 281, 20)
+RECT_PLAYLIST_DURATION = QRect(375, 13, 34, 20)
+RECT_PLAYLIST_ARTIST_NAME = QRect(94, 24, 281, 20)
+RECT_PLAYLIST_PLAY = QRect(11, 11, 24, 24)
+RECT_PLAYLIST_MORE = QRect(430, 8, 30, 30)
+SIZE_QUEUE_ROW = QSize(290, 54)  # 10 pixels of spacing above the 44 pixels high row
+QUEUE_ROW_OFFSET = QPoint(0, 10)
+RECT_QUEUE_ROW = QRect(0, 0, 290, 44)
+COLOR_QUEUE_ROW = QColor(35, 35, 35)
+RECT_QUEUE_SONG_NAME = QRect(10, 1, 161, 20)
+RECT_QUEUE_ARTIST_NAME = QRect(10, 23, 161, 20)
+RECT_QUEUE_UP = QRect(185, 7, 30, 30)
+RECT_QUEUE_DOWN = QRect(220, 7, 30, 30)
+RECT_QUEUE_REMOVE = QRect(255, 7, 30, 30)
+
+THUMBNAIL_CACHE_SIZE = 512  # Thumbnails kept decoded and scaled
+_thumbnail_cache: Dict[Tuple[int, int, int], QImage] = {}  # {(song id, width, height): thumbnail}
+_thumbnail_cache_lock = threading.Lock()  # Thumbnails are made on the threads that send songs to the window
+
+
+def song_thumbnail(song: Song, width: int, height: int) -> QImage:
+    """
+    Returns the song image decoded and scaled to width x height. Thumbnails are cached by song id and size,
+    so showing a song again neither reads, decodes nor scales its image.
+    It returns a QImage, so it can be called from any thread; only QPixmap.fromImage() is left for the GUI thread.
+    """
+
+    key = (song.song_id, width, height)
+    thumbnail = _thumbnail_cache.get(key)
+    if thumbnail is None:
+        image = QImage()
+        image.loadFromData(QtCore.QByteArray(song.image_binary), "PNG")
+        thumbnail = image.scaled(width, height, Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+        with _thumbnail_cache_lock:
+            if len(_thumbnail_cache) >= THUMBNAIL_CACHE_SIZE:
+                del _thumbnail_cache[next(iter(_thumbnail_cache))]  # Drop the oldest thumbnail
+            _thumbnail_cache[key] = thumbnail
+    return thumbnail
+
+
+@lru_cache(maxsize=None)
+def arial_font(point_size: int) -> QFont:
+    """
+    Returns the shared Arial font of the given point size.
+    Widgets copy the font in setFont(); the returned font itself must not be changed.
+    """
+
+    font = QFont()
+    font.setFamily("Arial")
+    font.setPointSize(point_size)
+    return font
+
+
+def add_song_menu_action(menu: QMenu, text: str, event_name: str, *args) -> None:
+    """
+    Adds an action to a song menu. The event name and its extra arguments are stored as the data of the action.
+    fire_song_menu_event() fires the event when the action is triggered.
+    """
+
+    action = menu.addAction(text)
+    action.setData((event_name, *args))
+
+
+def build_song_menu(parent: QWidget, geometry: QRect, playlist_links: List[str], triggered,
+                    current_playlist: str = None) -> QMenu:
+    """
+    Builds the menu of a song container: "Add to queue" and "Add to Playlist" for every playlist link.
+    Pass current_playlist for songs of a playlist: the menu gets "Remove from playlist" instead of
+    an "Add to Playlist" action for that playlist. triggered is connected to the triggered signal of the menu.
+    """
+
+    menu = QMenu(parent)
+    menu.setGeometry(geometry)
+    add_song_menu_action(menu, "Add to queue", "add_to_queue")
+    if current_playlist is not None:
+        add_song_menu_action(menu, "Remove from playlist", "remove_from_playlist")
+    for playlist_link in playlist_links:
+        if playlist_link != current_playlist:
+            add_song_menu_action(menu, f"Add to Playlist: {playlist_link}", "add_to_playlist", playlist_link)
+    menu.triggered.connect(triggered)
+    menu.setStyleSheet(STYLE_MENU)
+    return menu
+
+
+def fire_song_menu_event(song: Song, action: QAction) -> None:
+    """
+    Fires the event stored in the data of a song menu action for the given song.
+    """
+
+    event_name, *args = action.data()
+    if event_name == "remove_from_playlist":
+        Event(event_name, song.song_id, self_fire=True)
+    else:
+        Event(event_name, song, *args, self_fire=True)
+
 
 class ToolButton(QToolButton):
     """
@@ -80,24 +217,18 @@ class ShuffleButton(QToolButton):
         Call this method to change the state of the shuffle button: from 0 to 1 or from 1 to 0.
         Returns the changed state.
         """
-        if self._state == 0:
-            self._state = 1
-        elif self._state == 1:
-            self._state = 0
 
+        self._state ^= 1
         return self._state
 
+    @pyqtSlot()
     def set_state(self) -> None:
         """
         Call this method to set the state of the button. It calls change_state(), and then
         it sets the state.
         """
 
-        state = self.change_state()
-        if state == 0:
-            self.set_shuffle_off()
-        elif state == 1:
-            self.set_shuffle_on()
+        self._STATE_SETTERS[self.change_state()](self)
 
     def set_shuffle_off(self) -> None:
         """
@@ -115,6 +246,9 @@ class ShuffleButton(QToolButton):
         Event("shuffle_state", self._state, self_fire=True)
         self.setIcon(self.shuffle_on_icon)
 
+    # Indexed by state, so set_state() dispatches without comparing it
+    _STATE_SETTERS = (set_shuffle_off, set_shuffle_on)
+
 
 class RepeatButton(QToolButton):
     """
@@ -137,6 +271,7 @@ class RepeatButton(QToolButton):
         self.repeat_many_off_icon = repeat_many_off_icon
         self.repeat_many_on_icon = repeat_many_on_icon
         self.repeat_one_icon = repeat_one_icon
+        self._state_icons = (repeat_many_off_icon, repeat_many_on_icon, repeat_one_icon)  # Indexed by state
         self._state = 0
         self.clicked.connect(self.set_state)
 
@@ -146,12 +281,10 @@ class RepeatButton(QToolButton):
         0 represents repeat many off, 1 represents repeat many on, and 2 represents repeat one.
         """
 
-        if self._state == 2:
-            self._state = 0
-        else:
-            self._state += 1
+        self._state = (self._state + 1) % 3
         return self._state
 
+    @pyqtSlot()
     def set_state(self, state=None) -> None:
         """
         Call this method to set the state of the button. If no state is passed in the method,
@@ -163,40 +296,16 @@ class RepeatButton(QToolButton):
             current_state = state
         else:
             current_state = self.change_state()
+        self._apply_state(current_state)
 
-        if current_state == 0:
-            self.set_repeat_many_off()
-        elif current_state == 1:
-            self.set_repeat_many_on()
-        else:
-            self.set_repeat_one()
-
-    def set_repeat_many_off(self) -> None:
-        """
-        this method will fire a repeat_state 0 event, and set the icon to repeat many off.
-        """
-
-        self._state = 0
-        Event("repeat_state", self._state, self_fire=True)
-        self.setIcon(self.repeat_many_off_icon)
-
-    def set_repeat_many_on(self) -> None:
-        """
-        This method will fire a repeat_state 1 event, and set the icon to repeat many on.
-        """
-
-        self._state = 1
-        Event("repeat_state", self._state, self_fire=True)
-        self.setIcon(self.repeat_many_on_icon)
-
-    def set_repeat_one(self) -> None:
+    def _apply_state(self, state: int) -> None:
         """
-        This method will fire a repeat_state 2 event, and set the icon to repeat one.
+        This method will fire a repeat_state event with the state, and set the icon of the state.
         """
 
-        self._state = 2
-        Event("repeat_state", self._state, self_fire=True)
-        self.setIcon(self.repeat_one_icon)
+        self._state = state
+        Event("repeat_state", state, self_fire=True)
+        self.setIcon(self._state_icons[state])
 
 
 class PlaylistLinkContainer(QToolButton):
@@ -217,14 +326,10 @@ class PlaylistLinkContainer(QToolButton):
     def _set_self_params(self) -> None:
         self.setFixedHeight(25)
         self.setFixedWidth(290)
-        font = QFont()
-        font.setFamily("Arial")
-        font.setPointSize(11)
+        font = arial_font(11)
         self.setFont(font)
         self.setCursor(QCursor(Qt.PointingHandCursor))
-        self.setStyleSheet(
-            "background-color: rgb(35, 35, 35); color: white; border-radius: 5px; border: 0px solid rgb(0, 170, 127);"
-        )
+        self.setStyleSheet(STYLE_PLAYLIST_LINK)
         self.setText(self._playlist_link)
 
     def connect(self, method) -> None:
@@ -238,24 +343,25 @@ class PlaylistLinkContainer(QToolButton):
         Call this method to set active style to the playlist link container. It has a green rgb(0, 170, 127) border.
         """
 
-        self.setStyleSheet(
-            "background-color: rgb(35, 35, 35); color: white; border-radius: 5px; border: 1px solid rgb(0, 170, 127);"
-        )
-        self._is_active = True
+        self._set_active(True)
 
     def set_inactive_style(self):
         """
         Call this method to set inactive style to the playlist container. It does not have a border.
         """
 
-        self.setStyleSheet(
-            "background-color: rgb(35, 35, 35); color: white; border-radius: 5px; border: 0px solid rgb(0, 170, 127);"
-        )
-        self._is_active = False
+        self._set_active(False)
 
     def is_active(self) -> bool:
         return self._is_active
 
+    def _set_active(self, active: bool) -> None:
+        # Re-polishing applies the already parsed STYLE_PLAYLIST_LINK rules for the new property value
+        self._is_active = active
+        self.setProperty("active", active)
+        self.style().unpolish(self)
+        self.style().polish(self)
+
 
 class RecommendationContainer(QFrame):
     """
@@ -287,13 +393,14 @@ class RecommendationContainer(QFrame):
         self._set_song_name_inner()
         self._set_artist_name_inner()
         self._set_play_this_button()
-        self.set_menu()
 
     def set_playlist_links(self, playlist_links: List[str]) -> None:
         self._playlist_links = playlist_links
 
     def mousePressEvent(self, event: QtGui.QMouseEvent) -> None:
         if event.button() == Qt.RightButton:
+            if self.menu is None:  # Built on first use
+                self.set_menu()
             self.menu.exec_(self.mapToGlobal(event.pos()))
 
     def _set_self_params(self) -> None:
@@ -303,58 +410,45 @@ class RecommendationContainer(QFrame):
         self.setFrameShadow(QFrame.Raised)
 
     def set_menu(self) -> None:
-        self.menu = QMenu(self)
-        self.menu.setGeometry(QRect(420, 130, 36, 36))
-        self.menu.addAction("Add to queue", lambda: Event("add_to_queue", self._song, self_fire=True))
-        for playlist_link in self._playlist_links:
-            self._add_playlist_to_menu(self._song, playlist_link)
-        self.menu.setStyleSheet("""QMenu {background-color: rgb(60, 60, 60); color: white;} 
-            QMenu::item:selected {background-color: rgb(100, 100, 100);}""")
+        self.menu = build_song_menu(self, RECT_RECOMMENDATION_MENU, self._playlist_links, self._menu_triggered)
 
     def _set_image_container(self) -> None:
         self._image_container = QLabel(self)
-        self._image_container.setGeometry(QRect(1, 1, 148, 148))
+        self._image_container.setGeometry(RECT_RECOMMENDATION_IMAGE)
         self._image_container.setStyleSheet("background-color: transparent; border-radius: 0px;")
-        self._image_container.setScaledContents(True)
         self._image_container.setPixmap(self._image)
 
     def _set_song_name_inner(self) -> None:
-        font = QFont()
-        font.setFamily("Arial")
-        font.setPointSize(10)
+        font = arial_font(10)
         self._song_name_inner = QLabel(self)
-        self._song_name_inner.setGeometry(QRect(2, 151, 146, 16))
+        self._song_name_inner.setGeometry(RECT_RECOMMENDATION_SONG_NAME)
         self._song_name_inner.setFont(font)
         self._song_name_inner.setStyleSheet("background-color: transparent;")
         self._song_name_inner.setText(self._song.song_name)
 
     def _set_artist_name_inner(self) -> None:
-        font = QFont()
-        font.setFamily("Arial")
-        font.setPointSize(9)
+        font = arial_font(9)
         self._artist_name_inner = QLabel(self)
-        self._artist_name_inner.setGeometry(QRect(2, 168, 146, 16))
+        self._artist_name_inner.setGeometry(RECT_RECOMMENDATION_ARTIST_NAME)
         self._artist_name_inner.setFont(font)
-        self._artist_name_inner.setStyleSheet("background-color: transparent; color: rgb(85, 255, 255);")
+        self._artist_name_inner.setStyleSheet(STYLE_ARTIST_NAME)
         self._artist_name_inner.setText(self._song.artist_name)
 
     def _set_play_this_button(self) -> None:
         self._play_this_button = QToolButton(self)
-        self._play_this_button.setGeometry(QRect(6, 110, 34, 34))
+        self._play_this_button.setGeometry(RECT_RECOMMENDATION_PLAY)
         self._play_this_button.setStyleSheet(
             "background-color: black; border-radius: 17px; border: 1px solid rgb(100, 100, 100);"
         )
         self._play_this_button.setIcon(self._icon_play)
-        self._play_this_button.setIconSize(QSize(15, 15))
+        self._play_this_button.setIconSize(SIZE_ICON_SMALL)
         self._play_this_button.clicked.connect(
             lambda: Event("internal_request", "play_this", self._song, self_fire=True)
         )
 
-    def _add_playlist_to_menu(self, song: Song, playlist_link: str) -> None:
-        self.menu.addAction(
-            f"Add to Playlist: {playlist_link}",
-            lambda: Event("add_to_playlist", song, playlist_link, self_fire=True),
-        )
+    @pyqtSlot(QAction)
+    def _menu_triggered(self, action: QAction) -> None:
+        fire_song_menu_event(self._song, action)
 
 
 class SongSearchContainer(QFrame):
@@ -386,15 +480,34 @@ class SongSearchContainer(QFrame):
         self.image = image
         self._set_self_params()
         self._set_play_this_button()
-        self._set_img_container()
-        self._set_song_name_inner()
-        self._set_artist_name_inner()
         self._set_more_button()
-        self.set_menu()
 
     def set_playlist_links(self, playlist_links: List[str]) -> None:
         self._playlist_links = playlist_links
 
+    def reset_menu(self) -> None:
+        """
+        Call this method after the playlist links change. The menu is built again when it is opened next.
+        """
+
+        if self._menu is not None:
+            self._more_button.setMenu(None)
+            self._menu.deleteLater()
+            self._menu = None
+
+    def paintEvent(self, event: QtGui.QPaintEvent) -> None:
+        # The image and the names are painted here instead of being child QLabels
+        QFrame.paintEvent(self, event)
+        painter = QPainter(self)
+        painter.fillRect(RECT_SEARCH_IMAGE, COLOR_SONG_IMAGE)
+        painter.drawPixmap(1, 1, self.image)  # Already scaled to 60 x 60
+        painter.setPen(Qt.white)
+        painter.setFont(arial_font(12))
+        painter.drawText(RECT_SEARCH_SONG_NAME, TEXT_FLAGS, self.song.song_name)
+        painter.setFont(arial_font(11))
+        painter.drawText(RECT_SEARCH_ARTIST_NAME, TEXT_FLAGS, self.song.artist_name)
+        painter.end()
+
     def _set_self_params(self) -> None:
         self.setFixedSize(470, 62)
         self.setStyleSheet("background-color: rgb(35, 35, 35); border-radius: 8px;")
@@ -403,73 +516,41 @@ class SongSearchContainer(QFrame):
 
     def _set_play_this_button(self) -> None:
         self._play_this_button = QToolButton(self)
-        self._play_this_button.setGeometry(QRect(380, 13, 36, 36))
+        self._play_this_button.setGeometry(RECT_SEARCH_PLAY)
         self._play_this_button.setStyleSheet("background-color: transparent; border-radius: 18px;")
         self._play_this_button.setIcon(self.icon_play)
-        self._play_this_button.setIconSize(QSize(20, 20))
+        self._play_this_button.setIconSize(SIZE_ICON_MEDIUM)
         self._play_this_button.clicked.connect(
             lambda: Event("internal_request", "play_this", self.song, self_fire=True)
         )
 
-    def _set_img_container(self) -> None:
-        self._small_img_container = QLabel(self)
-        self._small_img_container.setGeometry(QRect(1, 1, 60, 60))
-        self._small_img_container.setStyleSheet("background-color: rgb(85, 85, 127); border-radius: 0px;")
-        self._small_img_container.setScaledContents(True)
-        self._small_img_container.setPixmap(self.image)
-
-    def _set_song_name_inner(self) -> None:
-        self._song_name_inner = QLabel(self)
-        self._song_name_inner.setGeometry(QRect(70, 5, 300, 24))
-        font = QFont()
-        font.setFamily("Arial")
-        font.setPointSize(12)
-        self._song_name_inner.setFont(font)
-        self._song_name_inner.setStyleSheet("background-color: transparent; color: white;")
-        self._song_name_inner.setText(self.song.song_name)
-
-    def _set_artist_name_inner(self) -> None:
-        self._artist_name_inner = QLabel(self)
-        self._artist_name_inner.setGeometry(QRect(70, 33, 300, 24))
-        font = QFont()
-        font.setFamily("Arial")
-        font.setPointSize(11)
-        self._artist_name_inner.setFont(font)
-        self._artist_name_inner.setStyleSheet("background-color: transparent; color: white;")
-        self._artist_name_inner.setText(self.song.artist_name)
-
     def _set_more_button(self) -> None:
         self._more_button = QPushButton(self)
         self._more_button.setObjectName("more_button")
-        self._more_button.setGeometry(QRect(420, 13, 36, 36))
+        self._more_button.setGeometry(RECT_MORE)
         font = QFont()
         font.setPointSize(10)
         self._more_button.setFont(font)
         self._more_button.setStyleSheet("""QPushButton::menu-indicator { image: none; } 
             QPushButton {background-color: transparent; border-radius: 18px;}""")
         self._more_button.setIcon(self.icon_more)
-        self._more_button.setIconSize(QSize(20, 20))
+        self._more_button.setIconSize(SIZE_ICON_MEDIUM)
+        self._more_button.pressed.connect(self._open_menu)
+
+    @pyqtSlot()
+    def _open_menu(self) -> None:
+        # The menu is built on first use; once set on the button, the button opens it by itself
+        if self._menu is None:
+            self.set_menu()
+            self._more_button.showMenu()
 
     def set_menu(self) -> None:
-        self._menu = QMenu(self)
-        self._menu.setGeometry(QRect(420, 13, 36, 36))
-        self._menu.addAction("Add to queue", lambda: Event("add_to_queue", self.song, self_fire=True))
-        for playlist_link in self._playlist_links:
-            self._add_playlist_to_menu(self.song, playlist_link)
-        self._menu.setStyleSheet("""QMenu {
-                                    background-color: rgb(60, 60, 60); 
-                                    color: white;
-                                    } 
-                                    QMenu::item:selected {
-                                    background-color: rgb(100, 100, 100);
-                                    }""")
+        self._menu = build_song_menu(self, RECT_MORE, self._playlist_links, self._menu_triggered)
         self._more_button.setMenu(self._menu)
 
-    def _add_playlist_to_menu(self, song: Song, playlist_link: str) -> None:
-        self._menu.addAction(
-            f"Add to Playlist: {playlist_link}",
-            lambda: Event("add_to_playlist", song, playlist_link, self_fire=True),
-        )
+    @pyqtSlot(QAction)
+    def _menu_triggered(self, action: QAction) -> None:
+        fire_song_menu_event(self.song, action)
 
 
 class SongPlaylistContainer(QFrame):
@@ -508,39 +589,54 @@ class SongPlaylistContainer(QFrame):
         self._image = image
         self._set_self_params()
         self._set_play_this_button_params(index)
-        self._set_small_img_container()
-        self._set_song_name_inner()
-        self._set_artist_name_inner()
         self._set_more_button()
-        self.set_menu()
-        self._set_playlist_time_label()
 
     def set_playlist_links(self, playlist_links: List[str]) -> None:
         self._playlist_links = playlist_links
 
     def enterEvent(self, event: QtCore.QEvent) -> None:
-        self.setStyleSheet("background-color: rgb(60, 10, 60); border-radius: 6px;")
+        self._set_hover(True)
         self._play_this_button.setIcon(self._icon_play)
 
     def leaveEvent(self, event: QtCore.QEvent) -> None:
-        self.setStyleSheet("background-color: transparent; border-radius: 6px;")
+        self._set_hover(False)
         self._play_this_button.setIcon(self._icon_empty)
 
+    def _set_hover(self, hover: bool) -> None:
+        # Re-polishing applies the already parsed STYLE_PLAYLIST_ROW rules for the new property value
+        self.setProperty("hover", hover)
+        self.style().unpolish(self)
+        self.style().polish(self)
+
     def mouseDoubleClickEvent(self, event: QtGui.QMouseEvent) -> None:
         Event("internal_request", "play_this", self._song, self_fire=True)
 
+    def paintEvent(self, event: QtGui.QPaintEvent) -> None:
+        # The image, the names and the duration are painted here instead of being child QLabels
+        QFrame.paintEvent(self, event)
+        painter = QPainter(self)
+        painter.fillRect(RECT_PLAYLIST_IMAGE, COLOR_SONG_IMAGE)
+        painter.drawPixmap(44, 1, self._image)  # Already scaled to 44 x 44
+        painter.setPen(Qt.white)
+        painter.setFont(arial_font(11))
+        painter.drawText(RECT_PLAYLIST_SONG_NAME, TEXT_FLAGS, self._song.song_name)
+        painter.setFont(arial_font(9))
+        painter.drawText(RECT_PLAYLIST_DURATION, TEXT_FLAGS, self._song.duration_string)
+        painter.setPen(COLOR_ARTIST_NAME)
+        painter.setFont(arial_font(10))
+        painter.drawText(RECT_PLAYLIST_ARTIST_NAME, TEXT_FLAGS, self._song.artist_name)
+        painter.end()
+
     def _set_self_params(self) -> None:
         self.setFixedSize(470, 46)
-        self.setStyleSheet("background-color: transparent; border-radius: 6px;")
+        self.setStyleSheet(STYLE_PLAYLIST_ROW)
         self.setFrameShape(QFrame.StyledPanel)
         self.setFrameShadow(QFrame.Raised)
 
     def _set_play_this_button_params(self, index: int) -> None:
-        font = QFont()
-        font.setFamily("Arial")
-        font.setPointSize(10)
+        font = arial_font(10)
         self._play_this_button = QToolButton(self)
-        self._play_this_button.setGeometry(QRect(11, 11, 24, 24))
+        self._play_this_button.setGeometry(RECT_PLAYLIST_PLAY)
         self._play_this_button.setStyleSheet("background-color: transparent; ")
         self._play_this_button.setFont(font)
         self._play_this_button.clicked.connect(
@@ -548,316 +644,203 @@ class SongPlaylistContainer(QFrame):
         )
         self._play_this_button.setText(str(index))
 
-    def _set_small_img_container(self) -> None:
-        self._small_img_container = QLabel(self)
-        self._small_img_container.setGeometry(QRect(44, 1, 44, 44))
-        self._small_img_container.setStyleSheet("background-color: rgb(85, 85, 127); border-radius: 0px;")
-        self._small_img_container.setScaledContents(True)
-        self._small_img_container.setPixmap(self._image)
-
-    def _set_song_name_inner(self) -> None:
-        font = QFont()
-        font.setFamily("Arial")
-        font.setPointSize(11)
-        self._song_name_inner = QLabel(self)
-        self._song_name_inner.setGeometry(QRect(94, 2, 281, 20))
-        self._song_name_inner.setFont(font)
-        self._song_name_inner.setStyleSheet("background-color: transparent; color: white;")
-        self._song_name_inner.setText(self._song.song_name)
-
-    def _set_artist_name_inner(self) -> None:
-        font = QFont()
-        font.setFamily("Arial")
-        font.setPointSize(10)
-        self._artist_name_inner = QLabel(self)
-        self._artist_name_inner.setGeometry(QRect(94, 24, 281, 20))
-        self._artist_name_inner.setFont(font)
-        self._artist_name_inner.setStyleSheet("background-color: transparent; color: rgb(85, 255, 255);")
-        self._artist_name_inner.setText(self._song.artist_name)
-
     def _set_more_button(self) -> None:
-        font = QFont()
-        font.setFamily("Arial")
-        font.setPointSize(10)
+        font = arial_font(10)
         self._more_button = QPushButton(self)
         self._more_button.setObjectName("more_button")
-        self._more_button.setGeometry(QRect(430, 8, 30, 30))
+        self._more_button.setGeometry(RECT_PLAYLIST_MORE)
         self._more_button.setFont(font)
         self._more_button.setStyleSheet(
             "QPushButton::menu-indicator { image: none; } QPushButton {background-color: transparent;}"
         )
         self._more_button.setIcon(self._icon_more)
+        self._more_button.pressed.connect(self._open_menu)
+
+    @pyqtSlot()
+    def _open_menu(self) -> None:
+        # The menu is built on first use; once set on the button, the button opens it by itself
+        if self._menu is None:
+            self.set_menu()
+            self._more_button.showMenu()
 
     def set_menu(self) -> None:
-        self._menu = QMenu(self)
-        self._menu.setGeometry(QRect(420, 13, 36, 36))
-        self._menu.addAction("Add to queue", lambda: Event("add_to_queue", self._song, self_fire=True))
-        self._menu.addAction(
-            "Remove from playlist",
-            lambda: Event("remove_from_playlist", self._song.song_id, self_fire=True),
+        self._menu = build_song_menu(
+            self, RECT_MORE, self._playlist_links, self._menu_triggered, current_playlist=self._current_playlist
         )
-        for playlist_link in self._playlist_links:
-            if playlist_link != self._current_playlist:
-                SongPlaylistContainer._add_playlist_to_menu(self._menu, self._song, playlist_link)
-        self._menu.setStyleSheet("""QMenu {background-color: rgb(60, 60, 60); color: white;} 
-            QMenu::item:selected {background-color: rgb(100, 100, 100);}""")
         self._more_button.setMenu(self._menu)
 
-    def _set_playlist_time_label(self) -> None:
-        font = QFont()
-        font.setFamily("Arial")
-        font.setPointSize(9)
-        self._playlist_time_label = QLabel(self)
-        self._playlist_time_label.setGeometry(QRect(375, 13, 34, 20))
-        self._playlist_time_label.setFont(font)
-        self._playlist_time_label.setStyleSheet("color: white; background-color: transparent;")
-        self._playlist_time_label.setText(self._song.duration_string)
-
-    @staticmethod
-    def _add_playlist_to_menu(menu, song: Song, playlist_link: str) -> None:
-        menu.addAction(
-            f"Add to Playlist: {playlist_link}",
-            lambda: Event("add_to_playlist", song, playlist_link, self_fire=True),
-        )
+    @pyqtSlot(QAction)
+    def _menu_triggered(self, action: QAction) -> None:
+        fire_song_menu_event(self._song, action)
 
 
-class RecommendationReceiver(QObject):
+class QueueModel(QAbstractListModel):
     """
     Summary:
-    This class represents a recommendation receiver. Use its receive_recommendation() method to receive
-    a recommendation from another thread. Once this method is called, the object will fire a pyqtSignal to
-    dynamically create QObjects.
+    This class holds the rows of the queue area as (song name, artist name, queue index) tuples.
 
     Usage:
-    Create an object of this class and connect it to a method you want to call when
-    a signal occurs. You can emit the signal with receive_recommendation().
-    """
-
-    recommendation_received = pyqtSignal(Song)
-
-    def __init__(self):
-        QObject.__init__(self)
-        self._recommendation = None
-
-    def fire(self) -> None:
-        self.recommendation_received.emit(self._recommendation)
-
-    def receive_recommendation(self, recommendation: Song) -> None:
-        self._recommendation = recommendation
-        self.fire()
-
-
-class RecommendationRemover(QObject):
+    Create an instance and set it as the model of a QueueView. Call set_rows() with (song, queue index)
+    pairs to replace all rows.
     """
-    Summary:
-    This class represents a pyqt remover for recommendations.
 
-    Usage:
-    Create an object of this class and connect it to a method you want to call when
-    a signal occurs. You can emit the signal with fire().
-    """
+    def __init__(self, parent: QObject) -> None:
+        QAbstractListModel.__init__(self, parent)
+        self._rows: List[Tuple[str, str, int]] = []
 
-    command_received = pyqtSignal()
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
 
-    def __init__(self):
-        QObject.__init__(self)
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        if role == Qt.UserRole:
+            return self._rows[index.row()]
+        if role == Qt.DisplayRole:
+            return self._rows[index.row()][0]
+        return None
 
-    def fire(self) -> None:
-        self.command_received.emit()
+    def set_rows(self, rows: List[Tuple[Song, int]]) -> None:
+        self.beginResetModel()
+        # The names are read from the songs once here, not on every repaint of a row
+        self._rows = [(song.song_name, song.artist_name, queue_index) for song, queue_index in rows]
+        self.endResetModel()
 
 
-class SongReceiver(QObject):
+class QueueDelegate(QStyledItemDelegate):
     """
     Summary:
-    This class represents a song receiver. It uses pyqtSignal() to get songs from separate thread
-    and create QObjects.
+    This class paints the rows of the queue area: song name, artist name, and the move up, move down and
+    remove icons. A click on an icon fires a 'move_up', 'move_down' or 'remove_from_queue' event with the
+    queue index of the song.
 
     Usage:
-    Create an object of this class and connect it to a method you want to call when
-    a signal occurs. You can emit the signal with receive_song().
+    Create an instance by passing the QueueView and a (default icon, hover icon) pair for each icon.
     """
 
-    song_received = pyqtSignal(Song)
-
-    def __init__(self):
-        QObject.__init__(self)
-        self._song = None
-
-    def fire(self) -> None:
-        self.song_received.emit(self._song)
-
-    def receive_song(self, song: Song) -> None:
-        self._song = song
-        self.fire()
-
-
-class SongRemover(QObject):
-    """
-    Summary:
-    This class represents a remover for searched songs. It uses pyqtSignal().
-
-    Usage:
-    Create an object of this class and connect it to a method you want to call when
-    a signal occurs. You can emit the signal with fire().
-    """
-
-    command_received = pyqtSignal()
-
-    def __init__(self):
-        QObject.__init__(self)
-
-    def fire(self) -> None:
-        self.command_received.emit()
-
-
-class PlaylistSongReceiver(QObject):
-    """
-    Summary:
-    This class represents a playlist song receiver that receives songs from a separate thread and
-    dynamically creates QObjects.
-
-    Usage:
-    Create an object of this class and connect it to a method you want to call when
-    a signal occurs. You can emit the signal with receive_song().
-    """
-
-    playlist_song_received = pyqtSignal(Song, str, int)
-
-    def __init__(self):
-        QObject.__init__(self)
-        self._playlist_song = None
-        self._current_playlist = None
-        self._index = None
-
-    def fire(self) -> None:
-        self.playlist_song_received.emit(self._playlist_song, self._current_playlist, self._index)
-
-    def receive_song(self, playlist_song: Song, current_playlist: str, index: int) -> None:
-        self._playlist_song = playlist_song
-        self._current_playlist = current_playlist
-        self._index = index
-        self.fire()
-
-
-class PlaylistSongRemover(QObject):
-    """
-    Summary:
-    This class represents a remover for playlist songs. It is used to delete objects.
-
-    Usage:
-    Create an object of this class and connect it to a method you want to call when
-    a signal occurs. You can emit the signal with fire().
-    """
-
-    command_received = pyqtSignal()
-
-    def __init__(self):
-        QObject.__init__(self)
-
-    def fire(self) -> None:
-        self.command_received.emit()
-
-
-class PlaylistLinkReceiver(QObject):
-    """
-    Summary:
-    This class represents a receiver for playlist links that are received from
-    a different thread, and it helps dynamically create QObjects.
-
-    Usage:
-    Create an object of this class and connect it to a method you want to call when
-    a signal occurs. You can emit the signal with receive_playlist_link().
-    """
-
-    playlist_link_received = pyqtSignal(str, bool)
-
-    def __init__(self):
-        QObject.__init__(self)
-        self._playlist_link = None
-        self._active = False
-
-    def fire(self) -> None:
-        self.playlist_link_received.emit(self._playlist_link, self._active)
-
-    def receive_playlist_link(self, playlist_link: str, active=False) -> None:
-        self._playlist_link = playlist_link
-        self._active = active
-        self.fire()
-
+    def __init__(self, view: "QueueView", up_icons: Tuple[QIcon, QIcon], down_icons: Tuple[QIcon, QIcon],
+                 remove_icons: Tuple[QIcon, QIcon]) -> None:
+        QStyledItemDelegate.__init__(self, view)
+        self._view = view
+        self._buttons = (
+            (RECT_QUEUE_UP, *up_icons, "move_up"),
+            (RECT_QUEUE_DOWN, *down_icons, "move_down"),
+            (RECT_QUEUE_REMOVE, *remove_icons, "remove_from_queue"),
+        )
 
-class PlaylistLinkRemover(QObject):
+    def sizeHint(self, option: QStyleOptionViewItem, index: QModelIndex) -> QSize:
+        return SIZE_QUEUE_ROW
+
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex) -> None:
+        song_name, artist_name, _ = index.data(Qt.UserRole)
+        origin = option.rect.topLeft() + QUEUE_ROW_OFFSET
+        hover_pos = self._view.hover_pos
+        if hover_pos is not None:
+            hover_pos = hover_pos - origin
+        painter.save()
+        painter.translate(origin)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(COLOR_QUEUE_ROW)
+        painter.drawRoundedRect(RECT_QUEUE_ROW, 6, 6)
+        painter.setPen(Qt.white)
+        painter.setFont(arial_font(11))
+        painter.drawText(RECT_QUEUE_SONG_NAME, TEXT_FLAGS, song_name)
+        painter.setPen(COLOR_ARTIST_NAME)
+        painter.setFont(arial_font(10))
+        painter.drawText(RECT_QUEUE_ARTIST_NAME, TEXT_FLAGS, artist_name)
+        for rect, default_icon, hover_icon, _ in self._buttons:
+            icon = hover_icon if hover_pos is not None and rect.contains(hover_pos) else default_icon
+            icon.paint(painter, rect.adjusted(7, 7, -7, -7))  # 16 x 16, the icon size of a tool button
+        painter.restore()
+
+    def editorEvent(self, event: QtCore.QEvent, model: QueueModel, option: QStyleOptionViewItem,
+                    index: QModelIndex) -> bool:
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+            pos = event.pos() - option.rect.topLeft() - QUEUE_ROW_OFFSET
+            for rect, _, _, event_name in self._buttons:
+                if rect.contains(pos):
+                    _, _, queue_index = index.data(Qt.UserRole)
+                    Event(event_name, queue_index, self_fire=True)
+                    return True
+        return False
+
+
+class QueueView(QListView):
     """
     Summary:
-    This class represents a remover for playlist links. It helps delete playlist links from
-    a separate thread.
+    This class represents the queue area. The songs are rows of a QueueModel painted by a QueueDelegate,
+    so only the visible rows are painted and no widget is created per song, however long the queue is.
 
     Usage:
-    Create an object of this class and connect it to a method you want to call when
-    a signal occurs. You can emit the signal with fire().
+    Create an instance by passing a (default icon, hover icon) pair for the move up, move down and remove
+    icons. Call set_songs() with (song, queue index) pairs to replace the displayed queue.
     """
 
-    command_received = pyqtSignal()
-
-    def __init__(self):
-        QObject.__init__(self)
-
-    def fire(self) -> None:
-        self.command_received.emit()
-
+    def __init__(self, parent: QObject, up_icons: Tuple[QIcon, QIcon], down_icons: Tuple[QIcon, QIcon],
+                 remove_icons: Tuple[QIcon, QIcon]) -> None:
+        QListView.__init__(self, parent)
+        self.hover_pos = None  # Cursor position in the viewport, None while the cursor is outside
+        self._model = QueueModel(self)
+        self.setModel(self._model)
+        self.setItemDelegate(QueueDelegate(self, up_icons, down_icons, remove_icons))
+        self._set_self_params()
 
-class QueueReceiver(QObject):
+    def _set_self_params(self) -> None:
+        self.setFrameShape(QFrame.NoFrame)
+        self.setUniformItemSizes(True)
+        self.setSelectionMode(QAbstractItemView.NoSelection)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.setFocusPolicy(Qt.NoFocus)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.viewport().setMouseTracking(True)
+
+    def set_songs(self, rows: List[Tuple[Song, int]]) -> None:
+        self._model.set_rows(rows)
+
+    def mouseMoveEvent(self, event: QtGui.QMouseEvent) -> None:
+        self.hover_pos = event.pos()
+        self.viewport().update()  # Repaints the icons under and no longer under the cursor
+        QListView.mouseMoveEvent(self, event)
+
+    def viewportEvent(self, event: QtCore.QEvent) -> bool:
+        if event.type() == QEvent.Leave:
+            self.hover_pos = None
+            self.viewport().update()
+        return QListView.viewportEvent(self, event)
+
+
+class MainThreadCaller(QObject):
     """
     Summary:
-    This class represents a receiver for queue songs. It allows receiving songs from another thread,
-    and dynamically creating QObjects on the main thread.
+    This class hands calls over from other threads to the main thread, in the way of asyncio's
+    loop.call_soon_threadsafe(). QObjects of the window must be created and deleted on the main thread.
 
     Usage:
-    Create an object of this class and connect it to a method you want to call when
-    a signal occurs. You can emit the signal with receive_song().
+    Create one instance on the main thread, and call call_soon(callback, *args) from any thread.
+    The main thread runs the calls in order; a call made on the main thread itself runs at once.
     """
 
-    queue_song_received = pyqtSignal(Song, int)
+    _called = pyqtSignal(object, tuple)
 
-    def __init__(self):
+    def __init__(self) -> None:
         QObject.__init__(self)
-        self._song = None
-        self._current_index = None
+        self._called.connect(self._run)
 
-    def fire(self) -> None:
-        self.queue_song_received.emit(self._song, self._current_index)
+    def call_soon(self, callback, *args) -> None:
+        self._called.emit(callback, args)
 
-    def receive_song(self, song: Song, current_index: int) -> None:
-        self._song = song
-        self._current_index = current_index
-        self.fire()
-
-
-class QueueRemover(QObject):
-    """
-    Summary:
-    This class represents a remover for queue songs. It deletes QObjects from
-    a separate thread.
-
-    Usage:
-    Create an object of this class and connect it to a method you want to call when
-    a signal occurs. You can emit the signal with fire().
-    """
-
-    command_received = pyqtSignal()
-
-    def __init__(self):
-        QObject.__init__(self)
-
-    def fire(self) -> None:
-        self.command_received.emit()
+    @pyqtSlot(object, tuple)
+    def _run(self, callback, args: tuple) -> None:
+        callback(*args)
 
 
 class Window(QWidget, Listener):
     """
     Summary:
     This is the main class of UI. This class represents the window. It inherits QWidget.
-    It contains static and dynamic entities. Dynamic entities are created using Receivers that
-    use pyqtSignal().
+    It contains static and dynamic entities. Dynamic entities are created on the main thread
+    through a MainThreadCaller.
 
     Usage:
     Create an instance of this class and use its public methods to interact.
@@ -868,7 +851,7 @@ class Window(QWidget, Listener):
 
     display_playlist_link() - to dynamically create playlists containers in playlist links widget.
 
-    display_queue() - to dynamically create queue songs in queue widget.
+    display_queue() - to display queue songs in queue widget.
 
     display_songs() - to dynamically create songs in search widget.
 
@@ -906,40 +889,7 @@ class Window(QWidget, Listener):
         # CREATE STATIC ENTITIES
 
         # PYQT SIGNALS
-        self.song_receiver = SongReceiver()
-        self.song_remover = SongRemover()
-        self.song_receiver.song_received.connect(self.display_one_song_search)
-        self.song_remover.command_received.connect(self.delete_search)
-
-        self.queue_receiver = QueueReceiver()
-        self.queue_remover = QueueRemover()
-        self.queue_receiver.queue_song_received.connect(
-            self.display_one_song_queue
-        )  # Add
-        self.queue_remover.command_received.connect(self.delete_queue)
-
-        self.playlist_link_receiver = PlaylistLinkReceiver()
-        self.playlist_link_remover = PlaylistLinkRemover()
-        self.playlist_link_receiver.playlist_link_received.connect(
-            self.display_one_playlist_link
-        )
-        self.playlist_link_remover.command_received.connect(self.delete_playlist_links)
-
-        self.playlist_song_receiver = PlaylistSongReceiver()
-        self.playlist_song_remover = PlaylistSongRemover()
-        self.playlist_song_receiver.playlist_song_received.connect(
-            self.display_one_song_playlist
-        )
-        self.playlist_song_remover.command_received.connect(self.delete_playlist_songs)
-
-        self.recommendation_receiver = RecommendationReceiver()
-        self.recommendation_remover = RecommendationRemover()
-        self.recommendation_receiver.recommendation_received.connect(
-            self.display_one_recommendation
-        )
-        self.recommendation_remover.command_received.connect(
-            self.delete_recommendations
-        )
+        self._main_thread = MainThreadCaller()
         # PYQT SIGNALS
 
         self.playlist_links = []
@@ -1043,9 +993,7 @@ class Window(QWidget, Listener):
     def _create_home_button(self) -> None:
         self._home_button = QToolButton(self)
         self._home_button.setGeometry(QRect(490, 45, 130, 50))
-        font = QFont()
-        font.setFamily("Arial")
-        font.setPointSize(16)
+        font = arial_font(16)
         self._home_button.setFont(font)
         self._home_button.setCursor(QCursor(Qt.PointingHandCursor))
         self._home_button.setStyleSheet(
@@ -1059,9 +1007,7 @@ class Window(QWidget, Listener):
     def _create_search_button(self) -> None:
         self._search_button = QToolButton(self)
         self._search_button.setGeometry(QRect(680, 45, 130, 50))
-        font = QFont()
-        font.setFamily("Arial")
-        font.setPointSize(16)
+        font = arial_font(16)
         self._search_button.setFont(font)
         self._search_button.setCursor(QCursor(Qt.PointingHandCursor))
         self._search_button.setStyleSheet(
@@ -1165,9 +1111,7 @@ class Window(QWidget, Listener):
         self._playlists_label = QLabel(self)
         self._playlists_label.setObjectName("label_2")
         self._playlists_label.setGeometry(QRect(30, 120, 8_1, 30))
-        font = QFont()
-        font.setFamily("Arial")
-        font.setPointSize(16)
+        font = arial_font(16)
         self._playlists_label.setFont(font)
         self._playlists_label.setStyleSheet("color: white; background-color: transparent;")
         self._playlists_label.setText("Playlists")
@@ -1175,33 +1119,22 @@ class Window(QWidget, Listener):
         self._scrollAreaPlaylistLinks.show()
 
     def _create_queue_area(self) -> None:
-        self._verticalFrameQueue = QFrame(self)
-        self._verticalFrameQueue.setGeometry(QRect(1230, 40, 16, 16))
-        self._verticalFrameQueue.setStyleSheet("background-color:transparent;")
-        self._verticalLayoutQueue = QVBoxLayout(self._verticalFrameQueue)
-        self._verticalLayoutQueue.setSpacing(10)
-        self._verticalLayoutQueue.setSizeConstraint(QLayout.SetMinimumSize)
-        self._verticalLayoutQueue.setContentsMargins(0, 10, 0, 0)
-        self._verticalLayoutQueue.setAlignment(QtCore.Qt.AlignTop)
-
-        self._scrollAreaQueue = QScrollArea(self)
-        self._scrollAreaQueue.setGeometry(QRect(950, 160, 320, 550))
-        self._scrollAreaQueue.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
-        self._scrollAreaQueue.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        self._scrollAreaQueue.setSizeAdjustPolicy(QAbstractScrollArea.AdjustIgnored)
-        self._scrollAreaQueue.setWidgetResizable(True)
-        self._scrollAreaQueue.setWidget(self._verticalFrameQueue)
+        self._queue_view = QueueView(
+            self,
+            (self._icon_arrow_up_default, self._icon_arrow_up_hover),
+            (self._icon_arrow_down_default, self._icon_arrow_down_hover),
+            (self._icon_remove_default, self._icon_remove_hover),
+        )
+        self._queue_view.setGeometry(QRect(950, 160, 320, 550))
 
         self._next_from_queue_label = QLabel(self)
         self._next_from_queue_label.setGeometry(QRect(952, 120, 161, 31))
-        font = QFont()
-        font.setFamily("Arial")
-        font.setPointSize(16)
+        font = arial_font(16)
         self._next_from_queue_label.setFont(font)
         self._next_from_queue_label.setStyleSheet("color: white; background-color: transparent;")
         self._next_from_queue_label.setText("Next from queue")
         self._next_from_queue_label.show()
-        self._scrollAreaQueue.show()
+        self._queue_view.show()
 
     def _create_stacked_widget(self) -> None:
         self._stackedWidget = QStackedWidget(self)
@@ -1219,9 +1152,7 @@ class Window(QWidget, Listener):
         self._gridLayoutRecommendations.setVerticalSpacing(50)
         self._label_recommended = QLabel(self._home_widget)
         self._label_recommended.setGeometry(QRect(200, 30, 140, 20))
-        font = QFont()
-        font.setFamily("Arial")
-        font.setPointSize(16)
+        font = arial_font(16)
         self._label_recommended.setFont(font)
         self._label_recommended.setStyleSheet("color: rgb(0, 255, 255);")
         self._label_recommended.setText("Recommended")
@@ -1240,9 +1171,7 @@ class Window(QWidget, Listener):
         self._playlist_widget = QWidget(self)
         self._playlist_name_label = QLabel(self._playlist_widget)
         self._playlist_name_label.setGeometry(QRect(60, 10, 321, 34))
-        font = QFont()
-        font.setFamily("Arial")
-        font.setPointSize(20)
+        font = arial_font(20)
         self._playlist_name_label.setFont(font)
         self._playlist_name_label.setStyleSheet("color: rgb(0, 255, 255); background-color: transparent;")
         self._playlist_name_label.setAlignment(Qt.AlignLeading | Qt.AlignLeft | Qt.AlignVCenter)
@@ -1266,9 +1195,7 @@ class Window(QWidget, Listener):
         self._search_entry_playlist = QLineEdit(self._playlist_widget)
         self._search_entry_playlist.setObjectName("search_entry_playlist")
         self._search_entry_playlist.setGeometry(QRect(29, 50, 401, 30))
-        font = QFont()
-        font.setFamily("Arial")
-        font.setPointSize(14)
+        font = arial_font(14)
         self._search_entry_playlist.setFont(font)
         self._search_entry_playlist.setStyleSheet("background-color: white; color: black; border-radius: 4px;")
         self._search_entry_playlist.setPlaceholderText("Search in playlist")
@@ -1301,9 +1228,7 @@ class Window(QWidget, Listener):
         self._search_entry = QLineEdit(self._search_widget)
         self._search_entry.setGeometry(QRect(22, 40, 468, 40))
         self._search_entry.setPlaceholderText("Search song, artist")
-        font = QFont()
-        font.setFamily("Arial")
-        font.setPointSize(14)
+        font = arial_font(14)
         self._search_entry.setFont(font)
         self._search_entry.setStyleSheet(
             "background-color: white; color: black; border-radius: 6px;"
@@ -1320,19 +1245,15 @@ class Window(QWidget, Listener):
         self._image_container.show()
         self._song_name = QLabel(self)
         self._song_name.setGeometry(QRect(40, 730, 300, 24))
-        font = QFont()
-        font.setFamily("Arial")
-        font.setPointSize(12)
+        font = arial_font(12)
         self._song_name.setFont(font)
-        self._song_name.setStyleSheet("background-color: transparent; color: white;")
+        self._song_name.setStyleSheet(STYLE_WHITE_TEXT)
         self._song_name.show()
         self._artist_name = QLabel(self)
         self._artist_name.setGeometry(QRect(40, 755, 300, 24))
-        font1 = QFont()
-        font1.setFamily("Arial")
-        font1.setPointSize(11)
+        font1 = arial_font(11)
         self._artist_name.setFont(font1)
-        self._artist_name.setStyleSheet("background-color: transparent; color: rgb(85, 255, 255);")
+        self._artist_name.setStyleSheet(STYLE_ARTIST_NAME)
         self._artist_name.show()
 
     def update_repeat_state(self, state: int) -> None:
@@ -1434,6 +1355,7 @@ class Window(QWidget, Listener):
         song_exists.setStandardButtons(QMessageBox.Ok | QMessageBox.Cancel)
         song_exists.show()
 
+    @pyqtSlot()
     def show_search_widget(self) -> None:
         """
         Call this method to show search widget.
@@ -1449,6 +1371,7 @@ class Window(QWidget, Listener):
         for i in range(1, len(self._verticalFramePlaylistLinks.children())):
             self._verticalFramePlaylistLinks.children()[i].set_inactive_style()
 
+    @pyqtSlot()
     def show_home_widget(self) -> None:
         """
         Call this method to show home widget.
@@ -1524,36 +1447,36 @@ class Window(QWidget, Listener):
         containers on the screen.
         """
 
+        self._main_thread.call_soon(self.delete_recommendations)
         if recommendations:
-            self.recommendation_remover.fire()
-            for recommendation in recommendations:
-                self.recommendation_receiver.receive_recommendation(recommendation)
-        else:
-            self.recommendation_remover.fire()
+            self._main_thread.call_soon(
+                self.display_batch,
+                self.display_one_recommendation,
+                [
+                    (recommendation, song_thumbnail(recommendation, 148, 148))
+                    for recommendation in recommendations
+                ],
+            )
 
     def display_songs(self, songs: List[Song]) -> None:
         """
         This method takes a list of songs (Song) and dynamically creates song containers on the screen.
         """
 
+        self._main_thread.call_soon(self.delete_search)
         if songs:
-            self.song_remover.fire()
-            for song in songs:
-                self.song_receiver.receive_song(song)  # Signal for PyQt custom event
-        else:
-            self.song_remover.fire()  # Signal for PyQt custom event
+            self._main_thread.call_soon(
+                self.display_batch,
+                self.display_one_song_search,
+                [(song, song_thumbnail(song, 60, 60)) for song in songs],
+            )
 
     def display_queue(self, queue) -> None:
         """
-        This method takes a list of queue songs (Song) and dynamically creates queue containers on the screen.
+        This method takes a list of queue songs (Song and queue index pairs) and shows them in the queue area.
         """
 
-        if queue:
-            self.queue_remover.fire()
-            for queue_song in queue:
-                self.queue_receiver.receive_song(queue_song[0], queue_song[1])  # Song and index
-        else:
-            self.queue_remover.fire()
+        self._main_thread.call_soon(self._queue_view.set_songs, list(queue))  # Song and index pairs
 
     def get_active_playlist_link(self) -> str:
         """
@@ -1583,17 +1506,17 @@ class Window(QWidget, Listener):
                 self.update_playlist_widget(active_link)
                 self.show_playlist_widget(active_link)
 
-            self.playlist_link_remover.fire()
+            self._main_thread.call_soon(self.delete_playlist_links)
             self.playlist_links.clear()
-            for playlist_link in playlist_links:
-                if playlist_link == active_link:
-                    # If current widget and this playlist link, set it to active again
-                    self.playlist_link_receiver.receive_playlist_link(playlist_link, active=True)
-                else:
-                    self.playlist_link_receiver.receive_playlist_link(playlist_link, active=False)
-                self.playlist_links.append(playlist_link)
+            # If current widget and this playlist link, set it to active again
+            self._main_thread.call_soon(
+                self.display_batch,
+                self.display_one_playlist_link,
+                [(playlist_link, playlist_link == active_link) for playlist_link in playlist_links],
+            )
+            self.playlist_links.extend(playlist_links)
         else:
-            self.playlist_link_remover.fire()
+            self._main_thread.call_soon(self.delete_playlist_links)
             self.playlist_links.clear()
 
     def display_playlist_songs(self, playlist_songs: List[Song], current_playlist: str) -> None:
@@ -1602,72 +1525,29 @@ class Window(QWidget, Listener):
         creates playlist songs objects on the screen.
         """
 
+        self._main_thread.call_soon(self.delete_playlist_songs)
         if playlist_songs:
-            self.playlist_song_remover.fire()
-            index = 1
-            for playlist_song in playlist_songs:
-                self.playlist_song_receiver.receive_song(
-                    playlist_song, current_playlist, index
-                )
-                index += 1
-        else:
-            self.playlist_song_remover.fire()
-
-    @pyqtSlot(Song, int)
-    def display_one_song_queue(self, song: Song, current_index: int) -> None:
-        """
-        This method will add a single song container to the queue area.
-        """
-
-        queue_container = QFrame(self._verticalFrameQueue)
-        queue_container.setFixedHeight(44)
-        queue_container.setFixedWidth(290)
-        queue_container.setStyleSheet("background-color: rgb(35, 35, 35); color: black; border-radius: 6px;")
-        queue_container.setFrameShape(QFrame.StyledPanel)
-        queue_container.setFrameShadow(QFrame.Raised)
-
-        song_name_queue = QLabel(queue_container)
-        song_name_queue.setObjectName("song_name_queue")
-        song_name_queue.setGeometry(QRect(10, 1, 161, 20))
-        font1 = QFont()
-        font1.setFamily("Arial")
-        font1.setPointSize(11)
-        song_name_queue.setFont(font1)
-        song_name_queue.setStyleSheet("background-color: transparent; color: white; border: 0px;")
-        song_name_queue.setText(song.song_name)
-
-        artist_name_queue = QLabel(queue_container)
-        artist_name_queue.setObjectName("artist_name_queue")
-        artist_name_queue.setGeometry(QRect(10, 23, 161, 20))
-        font3 = QFont()
-        font3.setFamily("Arial")
-        font3.setPointSize(10)
-        artist_name_queue.setFont(font3)
-        artist_name_queue.setStyleSheet("background-color: transparent; color: rgb(85, 255, 255); border: 0px")
-        artist_name_queue.setText(song.artist_name)
-
-        queue_up_button = ToolButton(queue_container, self._icon_arrow_up_default, self._icon_arrow_up_hover)
-        queue_up_button.setObjectName("queue_up_button")
-        queue_up_button.setGeometry(QRect(185, 7, 30, 30))
-        queue_up_button.setStyleSheet("background-color: transparent;")
-        queue_up_button.clicked.connect(lambda: Event("move_up", current_index, self_fire=True))
-        queue_up_button.setIcon(self._icon_arrow_up_default)
-
-        queue_down_button = ToolButton(queue_container, self._icon_arrow_down_default, self._icon_arrow_down_hover)
-        queue_down_button.setObjectName("queue_down_button")
-        queue_down_button.setGeometry(QRect(220, 7, 30, 30))
-        queue_down_button.setStyleSheet("background-color: transparent;")
-        queue_down_button.clicked.connect(lambda: Event("move_down", current_index, self_fire=True))
-        queue_down_button.setIcon(self._icon_arrow_down_default)
-
-        remove_from_queue_button = ToolButton(queue_container, self._icon_remove_default, self._icon_remove_hover)
-        remove_from_queue_button.setObjectName("remove_from_queue_button")
-        remove_from_queue_button.setGeometry(QRect(255, 7, 30, 30))
-        remove_from_queue_button.setStyleSheet("background-color: transparent;")
-        remove_from_queue_button.clicked.connect(lambda: Event("remove_from_queue", current_index, self_fire=True))
-        remove_from_queue_button.setIcon(self._icon_remove_default)
-
-        self._verticalLayoutQueue.addWidget(queue_container)
+            self._main_thread.call_soon(
+                self.display_batch,
+                self.display_one_song_playlist,
+                [
+                    (playlist_song, song_thumbnail(playlist_song, 44, 44), current_playlist, index)
+                    for index, playlist_song in enumerate(playlist_songs, 1)
+                ],
+            )
+
+    def display_batch(self, display_one, arguments: list) -> None:
+        """
+        This method calls display_one(*args) for every args in arguments. The window is repainted once,
+        after all QObjects have been created.
+        """
+
+        self.setUpdatesEnabled(False)
+        try:
+            for args in arguments:
+                display_one(*args)
+        finally:
+            self.setUpdatesEnabled(True)
 
     def _create_icons(self):
         self._icon_empty = QIcon()
@@ -1718,17 +1598,15 @@ class Window(QWidget, Listener):
         self._icon_shuffle_off = QIcon()
         self._icon_shuffle_off.addFile("../UI/shuffle_off.png")
 
-    @pyqtSlot(Song)
-    def display_one_recommendation(self, song: Song) -> None:
+    def display_one_recommendation(self, song: Song, image: QImage) -> None:
         """
         This method will add one recommendation song to the recommendation area.
         """
 
-        image = Window.from_bytes_to_pixmap(song.image_binary)
         container = RecommendationContainer(
             self._gridFrameRecommendations,
             song,
-            image,
+            QPixmap.fromImage(image),
             self.playlist_links,
             self._icon_play,
         )
@@ -1744,24 +1622,21 @@ class Window(QWidget, Listener):
         elif current_length == 5:
             self._gridLayoutRecommendations.addWidget(container, 1, 1)
 
-    @pyqtSlot(Song)
-    def display_one_song_search(self, song: Song) -> None:
+    def display_one_song_search(self, song: Song, image: QImage) -> None:
         """
         This song will add one song from search to the search area.
         """
 
-        image = Window.from_bytes_to_pixmap(song.image_binary)
         container = SongSearchContainer(
             self._verticalFrameSearch,
             song,
-            image,
+            QPixmap.fromImage(image),
             self.playlist_links,
             self._icon_play,
             self._icon_more,
         )
         self._verticalLayoutSearch.addWidget(container)
 
-    @pyqtSlot(str, bool)
     def display_one_playlist_link(self, playlist_link: str, active: bool) -> None:
         """
         This method will add one playlist link to playlist links area.
@@ -1792,17 +1667,15 @@ class Window(QWidget, Listener):
 
         self._playlist_name_label.setText(playlist_name)
 
-    @pyqtSlot(Song, str, int)
-    def display_one_song_playlist(self, song, current_playlist, index):
+    def display_one_song_playlist(self, song, image, current_playlist, index):
         """
         This method will add one playlist song (Song) to the playlist area.
         """
 
-        image = Window.from_bytes_to_pixmap(song.image_binary)
         container = SongPlaylistContainer(
             self._verticalFramePlaylist,
             song,
-            image,
+            QPixmap.fromImage(image),
             self.playlist_links,
             current_playlist,
             index,
@@ -1812,50 +1685,53 @@ class Window(QWidget, Listener):
         )
         self._verticalLayoutPlaylist.addWidget(container)
 
-    @pyqtSlot()
+    def _delete_containers(self, frame: QFrame) -> None:
+        """
+        Deletes all containers of the frame. Its first child is the layout, which is kept.
+        The window is repainted once, after all containers have been deleted.
+        """
+
+        self.setUpdatesEnabled(False)
+        try:
+            for container in frame.children()[1:]:
+                sip.delete(container)
+        finally:
+            self.setUpdatesEnabled(True)
+
     def delete_search(self) -> None:
         """
         Call this method to delete all song containers from search area.
         """
 
-        for i in range(1, len(self._verticalFrameSearch.children())):
-            sip.delete(self._verticalFrameSearch.children()[1])
+        self._delete_containers(self._verticalFrameSearch)
 
-    @pyqtSlot()
     def delete_queue(self) -> None:
         """
-        Call this method to delete all queue song containers from queue area.
+        Call this method to delete all songs from queue area.
         """
 
-        for i in range(1, len(self._verticalFrameQueue.children())):
-            sip.delete(self._verticalFrameQueue.children()[1])
+        self._queue_view.set_songs([])
 
-    @pyqtSlot()
     def delete_playlist_links(self) -> None:
         """
         Call this method to delete all playlist link containers from playlist links area.
         """
 
-        for i in range(1, len(self._verticalFramePlaylistLinks.children())):
-            sip.delete(self._verticalFramePlaylistLinks.children()[1])
+        self._delete_containers(self._verticalFramePlaylistLinks)
 
-    @pyqtSlot()
     def delete_playlist_songs(self):
         """
         Call this method to delete all playlist song containers from playlist area.
         """
 
-        for i in range(1, len(self._verticalFramePlaylist.children())):
-            sip.delete(self._verticalFramePlaylist.children()[1])
+        self._delete_containers(self._verticalFramePlaylist)
 
-    @pyqtSlot()
     def delete_recommendations(self):
         """
         Call this method to delete all recommendations from recommendation area.
         """
 
-        for i in range(1, len(self._gridFrameRecommendations.children())):
-            sip.delete(self._gridFrameRecommendations.children()[1])
+        self._delete_containers(self._gridFrameRecommendations)
 
     def receive_play_pause(self, value: bool) -> None:
         """
@@ -1874,4 +1750,4 @@ class Window(QWidget, Listener):
 
         for i in range(1, len(self._verticalFrameSearch.children())):
             self._verticalFrameSearch.children()[i].set_playlist_links(playlist_links)
-            self._verticalFrameSearch.children()[i].set_menu()
+            self._verticalFrameSearch.children()[i].reset_menu()
@@ -1,5 +1,5 @@
 import wave
-import pickle
+import struct
 import threading
 from socket import socket
 from sqlite3 import Connection
@@ -106,7 +106,7 @@ class ClientHandler:
         """
         This method handles a search song request. Pass a song to this method, and it will
         send all necessary information to the client.
-        This method will send the number of songs, and each individual found song.
+        This method will send the number of songs, the length of each found song, and all found songs.
         """
 
         if search_string != "":
@@ -116,26 +116,22 @@ class ClientHandler:
 
             self._cursor.execute(command)
             results = self._cursor.fetchall()
-            number_of_songs_found = len(results)
-            number_of_songs_found_bytes = number_of_songs_found.to_bytes(4, "little")
-            self.communication_tcp_send(number_of_songs_found_bytes, 4)
-
+            serialized_songs = []
             for row in results:
                 image_file_location = self._images_path + row[6]
-                image_bytes = open(
-                    image_file_location, "rb"
-                ).read()  # Change this so it handles exceptions with 'with'
+                with open(image_file_location, "rb") as image_file:
+                    image_bytes = image_file.read()
                 current_song = Song(row[0], row[1], row[2], row[5], image_bytes)
-                serialized_song = pickle.dumps(current_song)
-                data, data_length = self.slice_song_bytes(serialized_song)
-                data_length_bytes = data_length.to_bytes(4, "little")
-                self.communication_tcp_send(data_length_bytes, 4)
-                for i in range(data_length - 1):
-                    self.communication_tcp_send(data[i], 1024)
-                last_packet_length = len(data[-1])
-                last_packet_length_bytes = last_packet_length.to_bytes(4, "little")
-                self.communication_tcp_send(last_packet_length_bytes, 4)
-                self.communication_tcp_send(data[-1], last_packet_length)
+                serialized_songs.append(current_song.to_bytes())
+
+            # Number of songs and the length of every song up front, then all songs back to back
+            number_of_songs_found = len(serialized_songs)
+            header = struct.pack(
+                f"<I{number_of_songs_found}I", number_of_songs_found, *map(len, serialized_songs)
+            )
+            self.communication_tcp_send(header, len(header))
+            for serialized_song in serialized_songs:
+                self.communication_tcp_send(memoryview(serialized_song), len(serialized_song))
 
     def _streaming_loop(self) -> None:
         """
@@ -198,17 +194,18 @@ class ClientHandler:
 
             type_data = "data".encode("utf-8")
             type_exit = "exit".encode("utf-8")
+            packet_size = self._chunk * 4
 
             current_packet = song_bytes.readframes(self._chunk)
             # Do not send an incomplete packet
-            while len(current_packet) == self._chunk * 4:
+            while len(current_packet) == packet_size:
                 if self._stop_send:
                     self._stop_send = False
-                    self.streaming_tcp_send(type_exit, 4)
+                    # Every frame has the same size, so the exit frame is padded
+                    self.streaming_tcp_send(type_exit + bytes(packet_size), 4 + packet_size)
                     break
 
-                self.streaming_tcp_send(type_data, 4)
-                self.streaming_tcp_send(current_packet, 4096)
+                self.streaming_tcp_send(type_data + current_packet, 4 + packet_size)  # Type and packet in one frame
                 current_packet = song_bytes.readframes(self._chunk)
         else:
             song_data_length = 0
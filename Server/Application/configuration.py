@@ -1,8 +1,8 @@
-from configparser import ConfigParser
+from configparser import RawConfigParser
 
 
 path = 'config.ini'
-parser = ConfigParser()
+parser = RawConfigParser()
 parser.read(path)
 
 
@@ -18,6 +18,10 @@ def get_port_streaming() -> int:
     return parser.getint('server', 'port_streaming', fallback=9090)
 
 
+def get_socket_buffer_size() -> int:
+    return parser.getint('server', 'socket_buffer_size', fallback=8388608)
+
+
 def get_db_relative_path() -> str:
     return parser.get('database', 'db_relative_path', fallback='')
 
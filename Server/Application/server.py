@@ -31,8 +31,11 @@ class Server(Listener):
         self.HOST = configuration.get_host()
         self.PORT_COMMUNICATION = configuration.get_port_communication()
         self.PORT_STREAMING = configuration.get_port_streaming()
+        self.SOCKET_BUFFER_SIZE = configuration.get_socket_buffer_size()
         self._communication_socket = self._create_communication_socket()
         self._streaming_socket = self._create_streaming_socket()
+        self._set_buffer_sizes(self._communication_socket, self.SOCKET_BUFFER_SIZE)
+        self._set_buffer_sizes(self._streaming_socket, self.SOCKET_BUFFER_SIZE)
         self._awake_socket(self._communication_socket, self.HOST, self.PORT_COMMUNICATION)
         self._awake_socket(self._streaming_socket, self.HOST, self.PORT_STREAMING)
         # SOCKET
@@ -164,6 +167,16 @@ class Server(Listener):
         streaming_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         return streaming_socket
 
+    @staticmethod
+    def _set_buffer_sizes(server_socket: socket, buffer_size: int) -> None:
+        """
+        Call this method before listening to set the send and receive buffer sizes of a socket.
+        Accepted client sockets inherit these sizes.
+        """
+
+        server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, buffer_size)
+        server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, buffer_size)
+
     @staticmethod
     def _awake_socket(server_socket: socket, host: str, port: int) -> None:
         """
@@ -1,3 +1,9 @@
+import struct
+
+# song_id, song name length, artist name length, duration, image length (little-endian)
+SONG_HEADER = struct.Struct("<IHHII")
+
+
 class Song:
     """
     This class represents a song. It contains the data of a song.
@@ -11,6 +17,26 @@ class Song:
         self.duration_string = self._seconds_to_string(duration)
         self.image_binary = image_binary
 
+    def to_bytes(self) -> bytearray:
+        """
+        Serializes the song as SONG_HEADER followed by the UTF-8 song name, the UTF-8 artist name and the image.
+        """
+
+        song_name_bytes = self.song_name.encode("utf-8")
+        artist_name_bytes = self.artist_name.encode("utf-8")
+        header_size = SONG_HEADER.size
+        data = bytearray(header_size + len(song_name_bytes) + len(artist_name_bytes) + len(self.image_binary))
+        SONG_HEADER.pack_into(
+            data, 0, self.song_id, len(song_name_bytes), len(artist_name_bytes), int(self.duration),
+            len(self.image_binary)
+        )
+        artist_name_offset = header_size + len(song_name_bytes)
+        image_offset = artist_name_offset + len(artist_name_bytes)
+        data[header_size:artist_name_offset] = song_name_bytes
+        data[artist_name_offset:image_offset] = artist_name_bytes
+        data[image_offset:] = self.image_binary
+        return data
+
     @staticmethod
     def _seconds_to_string(seconds):
         """Converts seconds to minute and seconds (00:00)"""
@@ -19,12 +45,4 @@ class Song:
         return f"{minutes:0>2d}:{seconds:0>2d}"
 
     def __str__(self):
-        return (
-            str(self.song_id)
-            + ", "
-            + self.song_name
-            + ", "
-            + self.artist_name
-            + ", "
-            + str(self.duration)
-        )
+        return f"{self.song_id}, {self.song_name}, {self.artist_name}, {self.duration}"
@@ -78,6 +78,11 @@ class TestSong(unittest.TestCase):
     def test_seconds_to_string(self):
         self.assertEqual(song.Song._seconds_to_string(60), "01:00")
 
+    def test_to_bytes(self):
+        data = song.Song(7, "Name", "Artist", 185, b"IMAGE").to_bytes()
+        self.assertEqual(song.SONG_HEADER.unpack_from(data), (7, 4, 6, 185, 5))
+        self.assertEqual(bytes(data[song.SONG_HEADER.size:]), b"NameArtistIMAGE")
+
 
 if __name__ == '__main__':
     unittest.main()